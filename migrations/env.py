@@ -12,6 +12,7 @@ from src.models.event import Event  # noqa: F401
 from src.models.outbox import Outbox  # noqa: F401
 from src.models.place import Place  # noqa: F401
 from src.models.seats_cache import EventSeatsCache  # noqa: F401
+from src.models.sync_checkpoint import SyncCheckpoint  # noqa: F401
 from src.models.sync_metadata import SyncMetadata  # noqa: F401
 from src.models.ticket import Ticket  # noqa: F401
 
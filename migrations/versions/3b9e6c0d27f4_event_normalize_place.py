@@ -0,0 +1,75 @@
+"""event_normalize_place
+
+Revision ID: 3b9e6c0d27f4
+Revises: 5d2f8e1a9c47
+Create Date: 2026-10-18 14:02:44.905126
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b9e6c0d27f4"
+down_revision: Union[str, Sequence[str], None] = "5d2f8e1a9c47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("event", sa.Column("place_id", sa.UUID(), nullable=True))
+    # Move places out of event JSON, keeping the latest version of each
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO place (id, name, city, address, seats_pattern,
+                               changed_at, created_at)
+            SELECT DISTINCT ON ((place->>'id')::uuid)
+                (place->>'id')::uuid,
+                place->>'name',
+                place->>'city',
+                place->>'address',
+                place->>'seats_pattern',
+                (place->>'changed_at')::timestamptz,
+                (place->>'created_at')::timestamptz
+            FROM event
+            ORDER BY (place->>'id')::uuid, (place->>'changed_at')::timestamptz DESC
+            ON CONFLICT (id) DO NOTHING
+            """
+        )
+    )
+    op.execute(sa.text("UPDATE event SET place_id = (place->>'id')::uuid"))
+    op.alter_column("event", "place_id", nullable=False)
+    op.create_foreign_key("event_place_id_fkey", "event", "place", ["place_id"], ["id"])
+    op.create_index("ix_event_place_id", "event", ["place_id"], unique=False)
+    op.drop_column("event", "place")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column("event", sa.Column("place", sa.JSON(), nullable=True))
+    op.execute(
+        sa.text(
+            """
+            UPDATE event SET place = json_build_object(
+                'id', place.id,
+                'name', place.name,
+                'city', place.city,
+                'address', place.address,
+                'seats_pattern', place.seats_pattern,
+                'changed_at', place.changed_at,
+                'created_at', place.created_at
+            )
+            FROM place
+            WHERE place.id = event.place_id
+            """
+        )
+    )
+    op.alter_column("event", "place", nullable=False)
+    op.drop_index("ix_event_place_id", table_name="event")
+    op.drop_constraint("event_place_id_fkey", "event", type_="foreignkey")
+    op.drop_column("event", "place_id")
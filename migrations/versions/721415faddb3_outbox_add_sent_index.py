@@ -0,0 +1,44 @@
+"""outbox_add_sent_index
+
+Revision ID: 721415faddb3
+Revises: 88e074a35183
+Create Date: 2026-10-18 12:10:37.905114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "721415faddb3"
+down_revision: Union[str, Sequence[str], None] = "88e074a35183"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build index without blocking outbox inserts from ticket purchases
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_outbox_sent_updated_at",
+            "outbox",
+            ["updated_at"],
+            unique=False,
+            postgresql_where=sa.text("status = 'SENT'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_outbox_sent_updated_at",
+            table_name="outbox",
+            postgresql_where=sa.text("status = 'SENT'"),
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,61 @@
+"""outbox_add_next_attempt_at
+
+Revision ID: 88e074a35183
+Revises: caac06c38f51
+Create Date: 2026-10-18 11:47:03.218455
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "88e074a35183"
+down_revision: Union[str, Sequence[str], None] = "caac06c38f51"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "outbox",
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.drop_index(
+        "ix_outbox_status",
+        table_name="outbox",
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.create_index(
+        "ix_outbox_status",
+        "outbox",
+        ["status", "next_attempt_at", "created_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_outbox_status",
+        table_name="outbox",
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.create_index(
+        "ix_outbox_status",
+        "outbox",
+        ["status", "created_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.drop_column("outbox", "next_attempt_at")
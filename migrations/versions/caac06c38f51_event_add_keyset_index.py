@@ -0,0 +1,41 @@
+"""event_add_keyset_index
+
+Revision ID: caac06c38f51
+Revises: 4474e8a34eb4
+Create Date: 2026-10-18 10:52:11.402817
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "caac06c38f51"
+down_revision: Union[str, Sequence[str], None] = "4474e8a34eb4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build index without blocking writes to event table during sync
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_event_event_time_id",
+            "event",
+            ["event_time", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_event_event_time_id",
+            table_name="event",
+            postgresql_concurrently=True,
+        )
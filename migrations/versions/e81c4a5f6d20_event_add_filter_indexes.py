@@ -0,0 +1,69 @@
+"""event_add_filter_indexes
+
+Revision ID: e81c4a5f6d20
+Revises: 3b9e6c0d27f4
+Create Date: 2026-10-18 14:37:19.442871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e81c4a5f6d20"
+down_revision: Union[str, Sequence[str], None] = "3b9e6c0d27f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    # Build indexes without blocking writes to event table during sync
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_event_status_event_time",
+            "event",
+            ["status", "event_time"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_event_name_trgm",
+            "event",
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_place_city"),
+            "place",
+            ["city"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_place_city"), table_name="place", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_event_name_trgm",
+            table_name="event",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_event_status_event_time",
+            table_name="event",
+            postgresql_concurrently=True,
+        )
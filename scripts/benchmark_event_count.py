@@ -0,0 +1,86 @@
+"""
+Compare strategies for fetching a page of events along with total count.
+
+'joined window' counts with a window function over event rows joined to
+place, as get_many_with_count used to: every filtered row is joined and
+sorted before LIMIT applies. 'bare window' takes the window count and page
+of IDs from the bare event table and joins place for page rows only, as
+get_many_with_count does now. 'separate count' runs COUNT(*) and the page
+query as two statements, as before the window count was introduced.
+
+Each strategy is run unfiltered and with a selective filter, on the
+database configured by POSTGRES_CONNECTION_STRING.
+
+Usage: uv run python -m scripts.benchmark_event_count [page_size] [repeats]
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import func, select
+
+from src.crud.events import events_crud
+from src.database.database import async_session_local, engine
+from src.models.event import Event
+
+
+async def joined_window(db, filters: tuple, page_size: int) -> int:
+    stmt = (
+        select(Event, func.count().over().label("total_count"))
+        .filter(*filters)
+        .order_by(Event.event_time)
+        .limit(page_size)
+    )
+    rows = (await db.execute(stmt)).all()
+    return rows[0].total_count if rows else 0
+
+
+async def bare_window(db, filters: tuple, page_size: int) -> int:
+    count, _ = await events_crud.get_many_with_count(
+        db, *filters, order_by=Event.event_time, limit=page_size
+    )
+    return count
+
+
+async def separate_count(db, filters: tuple, page_size: int) -> int:
+    count = await events_crud.count_filtered(db, *filters)
+    await events_crud.get_many(db, *filters, order_by=Event.event_time, limit=page_size)
+    return count
+
+
+async def measure(strategy, filters: tuple, page_size: int, repeats: int) -> float:
+    """Return best time of strategy over repeats, in milliseconds"""
+    best = float("inf")
+    async with async_session_local() as db:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            await strategy(db, filters, page_size)
+            best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def main() -> None:
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    cases = {
+        "unfiltered": (),
+        "filtered": (Event.status == "published", Event.name.ilike("%rock%")),
+    }
+    strategies = {
+        "joined window": joined_window,
+        "bare window": bare_window,
+        "separate count": separate_count,
+    }
+    async with async_session_local() as db:
+        total = await events_crud.count_rows(db)
+    print(f"events: {total}, page size: {page_size}, repeats: {repeats}")
+    for case, filters in cases.items():
+        for name, strategy in strategies.items():
+            elapsed = await measure(strategy, filters, page_size, repeats)
+            print(f"{case:12} {name:16} {elapsed:8.2f} ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""
+Compare per-row cost of serializing events listing responses.
+
+'response_model' path mimics what FastAPI did before: rows are validated
+into response models, the response is dumped and validated again against
+response_model, passed through jsonable_encoder and encoded by stdlib json.
+'pydantic' path validates rows once and dumps the response straight to
+bytes with Pydantic's serializer, as PydanticJSONResponse does.
+
+Usage: uv run python -m scripts.benchmark_serialization [rows] [repeats]
+"""
+
+import json
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+
+from src.models.event import Event
+from src.models.place import Place
+from src.schemas.event import PaginatedEventResponse, PaginatedEventsResponse
+
+
+def make_events(rows: int) -> list[Event]:
+    """Build transient Event rows with places, as loaded from database"""
+    now = datetime.now(UTC)
+    place = Place(
+        id=uuid4(),
+        name="Concert Hall",
+        city="Moscow",
+        address="Tverskaya st., 1",
+        seats_pattern="A1-100,B1-200",
+        changed_at=now,
+        created_at=now,
+    )
+    return [
+        Event(
+            id=uuid4(),
+            name=f"Event {i}",
+            place_id=place.id,
+            place=place,
+            event_time=now + timedelta(days=i),
+            registration_deadline=now + timedelta(days=i - 1),
+            status="published",
+            number_of_visitors=i,
+            changed_at=now,
+            created_at=now,
+            status_changed_at=now,
+        )
+        for i in range(rows)
+    ]
+
+
+def build_response(events: list[Event]) -> PaginatedEventsResponse:
+    return PaginatedEventsResponse(
+        count=len(events),
+        next="http://localhost/api/events/?page=2",
+        previous=None,
+        results=[PaginatedEventResponse.model_validate(event) for event in events],
+    )
+
+
+def response_model_path(events: list[Event]) -> bytes:
+    response = build_response(events)
+    validated = PaginatedEventsResponse.model_validate(response.model_dump())
+    content = jsonable_encoder(validated)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def pydantic_path(events: list[Event]) -> bytes:
+    response = build_response(events)
+    return response.__pydantic_serializer__.to_json(response)
+
+
+def measure(func, events: list[Event], repeats: int) -> float:
+    """Return best per-row time of func over repeats, in microseconds"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(events)
+        best = min(best, time.perf_counter() - start)
+    return best / len(events) * 1_000_000
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    events = make_events(rows)
+    assert json.loads(response_model_path(events)) == json.loads(pydantic_path(events))
+
+    before = measure(response_model_path, events, repeats)
+    after = measure(pydantic_path, events, repeats)
+    print(f"rows per response: {rows}, repeats: {repeats}")
+    print(f"response_model path: {before:8.2f} us/row")
+    print(f"pydantic path:       {after:8.2f} us/row")
+    print(f"speedup:             {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
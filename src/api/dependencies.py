@@ -1,9 +1,9 @@
-from typing import Annotated, Any, AsyncGenerator
+from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.database import get_db
+from src.database.database import get_db, get_read_db
 from src.external.events_provider import EventsProviderClient
 from src.services.event_service import EventService
 from src.services.sync_service import SyncService
@@ -24,6 +24,17 @@ async def get_event_service(
     return EventService(db)
 
 
+async def get_read_event_service(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> EventService:
+    """
+    Dependency that returns an instance of EventService initialised with
+    read-only database session, served by read replica when available.
+    For use by route handlers that only read events
+    """
+    return EventService(db)
+
+
 async def get_ticket_service(
     db: Annotated[AsyncSession, Depends(get_db)],
     events_service: Annotated[EventService, Depends(get_event_service)],
@@ -49,10 +60,10 @@ async def get_sync_service(
     return SyncService(db, provider_client)
 
 
-async def get_events_provider_client() -> AsyncGenerator[Any, Any]:
+async def get_events_provider_client(request: Request) -> EventsProviderClient:
     """
-    Dependency that yields an instance of EventsProviderClient for
-    interaction with external Events Provider
+    Dependency that returns application-scoped instance of
+    EventsProviderClient for interaction with external Events Provider,
+    created in application lifespan and shared across requests
     """
-    async with EventsProviderClient() as client:
-        yield client
+    return request.app.state.events_provider_client
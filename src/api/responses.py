@@ -0,0 +1,20 @@
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response rendered straight to bytes by Pydantic's serializer.
+    Pydantic models returned in it are dumped as they are, skipping
+    FastAPI's response_model revalidation and jsonable_encoder pass.
+    Other content (including UUID and datetime values) is dumped with
+    pydantic_core as well, so no stdlib json encoder is involved
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return to_json(content)
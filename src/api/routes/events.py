@@ -1,11 +1,12 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 
 from src.api.dependencies import (
     get_event_service,
     get_events_provider_client,
+    get_read_event_service,
 )
 from src.external.events_provider import (
     EventsProviderClient,
@@ -16,33 +17,72 @@ from src.schemas.event import (
     PaginatedEventsResponse,
     SingleEventResponse,
 )
+from src.api.responses import PydanticJSONResponse
+from src.config import dev_settings
 from src.services.event_service import EventService
+from src.utils.http_cache import conditional_response
 from src.utils.log import get_logger
 
 log = get_logger(__name__)
-events_router = APIRouter(prefix="/api", tags=["Events"])
+events_router = APIRouter(
+    prefix="/api", tags=["Events"], default_response_class=PydanticJSONResponse
+)
 
 
 @events_router.get("/events", response_model=PaginatedEventsResponse)
 async def get_events(
     request: Request,
+    response: Response,
     query_params: Annotated[PaginatedEventsRequest, Depends()],
-    service: Annotated[EventService, Depends(get_event_service)],
+    service: Annotated[EventService, Depends(get_read_event_service)],
 ):
-    return await service.get_events(
-        query_params.date_from,
-        query_params.page,
-        query_params.page_size,
-        str(request.url_for("get_events")),
-        dict(request.query_params),
+    version = await service.get_data_version()
+    not_modified = conditional_response(
+        request, response, version, dev_settings.EVENTS_CACHE_MAX_AGE_SECONDS
+    )
+    if not_modified:
+        return not_modified
+    url = str(request.url_for("get_events"))
+    # Links are built from validated parameters only, which key the cache:
+    # unknown parameters of one client must not leak into cached links
+    params = query_params.model_dump(mode="json", exclude_none=True)
+    cache_key = (version, url, tuple(sorted(params.items())))
+    content = await service.get_events_json(
+        cache_key,
+        date_from=query_params.date_from,
+        page=query_params.page,
+        page_size=query_params.page_size,
+        url=url,
+        query_params=params,
+        pagination=query_params.pagination,
+        cursor=query_params.cursor,
+        count_mode=query_params.count,
+        date_to=query_params.date_to,
+        status=query_params.status,
+        city=query_params.city,
+        place_id=query_params.place_id,
+        name=query_params.name,
     )
+    return Response(content, media_type="application/json", headers=response.headers)
 
 
 @events_router.get("/events/{event_id}", response_model=SingleEventResponse)
 async def get_single_event(
-    event_id: UUID, service: Annotated[EventService, Depends(get_event_service)]
+    event_id: UUID,
+    request: Request,
+    response: Response,
+    service: Annotated[EventService, Depends(get_read_event_service)],
 ):
-    return await service.get_single_event(event_id)
+    version = await service.get_data_version()
+    # Unknown event is 404 regardless of validators, not 304
+    event = await service.get_single_event(event_id)
+    not_modified = conditional_response(
+        request, response, version, dev_settings.EVENTS_CACHE_MAX_AGE_SECONDS
+    )
+    if not_modified:
+        return not_modified
+    event = SingleEventResponse.model_validate(event)
+    return PydanticJSONResponse(event, headers=response.headers)
 
 
 @events_router.get("/events/{event_id}/seats", response_model=EventSeatsResponse)
@@ -51,4 +91,4 @@ async def get_seats(
     client: Annotated[EventsProviderClient, Depends(get_events_provider_client)],
     service: Annotated[EventService, Depends(get_event_service)],
 ):
-    return await service.get_seats(event_id, client)
+    return PydanticJSONResponse(await service.get_seats(event_id, client))
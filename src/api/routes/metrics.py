@@ -1,21 +1,35 @@
-from typing import Annotated
+import os
 
-from fastapi import Response, APIRouter, Depends
-from prometheus_client import generate_latest, REGISTRY, Gauge
-
-from src.api.dependencies import get_event_service
-from src.services.event_service import EventService
+from fastapi import Response, APIRouter
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    generate_latest,
+    multiprocess,
+    REGISTRY,
+)
 
 metrics_router = APIRouter(tags=["metrics"])
 
-events_total = Gauge("events_total", "Total number of events")
 
+def get_registry() -> CollectorRegistry:
+    """
+    Return registry to expose: in multiprocess mode, a fresh one that
+    aggregates metrics of all worker processes, global registry otherwise
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
 
-@metrics_router.get("/metrics")
-async def metrics(
-    service: Annotated[EventService, Depends(get_event_service)],
-):
-    count = await service.get_events_count()
-    events_total.set(count)
 
-    return Response(content=generate_latest(REGISTRY), media_type="text/plain")
+@metrics_router.get("/metrics")
+async def metrics():
+    """
+    Serialize in-memory metrics registry. Business gauges are refreshed
+    by background collector, so scrapes don't touch the database
+    """
+    return Response(
+        content=generate_latest(get_registry()), media_type=CONTENT_TYPE_LATEST
+    )
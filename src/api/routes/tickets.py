@@ -6,13 +6,16 @@ from fastapi import APIRouter, Depends, status
 from src.api.dependencies import (
     get_ticket_service,
 )
+from src.api.responses import PydanticJSONResponse
 from src.schemas.ticket import BuyTicketRequest, TicketResponse
 from src.services.ticket_service import TicketService
 from src.utils.log import get_logger
 
 log = get_logger(__name__)
 
-ticket_router = APIRouter(prefix="/api", tags=["Tickets"])
+ticket_router = APIRouter(
+    prefix="/api", tags=["Tickets"], default_response_class=PydanticJSONResponse
+)
 
 
 @ticket_router.post(
@@ -22,7 +25,10 @@ async def buy_ticket(
     ticket_data: BuyTicketRequest,
     service: Annotated[TicketService, Depends(get_ticket_service)],
 ):
-    return await service.buy_ticket(dict(ticket_data))
+    ticket = await service.buy_ticket(dict(ticket_data))
+    return PydanticJSONResponse(
+        TicketResponse.model_validate(ticket), status_code=status.HTTP_201_CREATED
+    )
 
 
 @ticket_router.delete("/tickets/{ticket_id}")
@@ -13,9 +13,24 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_PORT: int
     POSTGRES_CONNECTION_STRING: str = None
+    POSTGRES_REPLICA_CONNECTION_STRING: str | None = None
+    REPLICA_MAX_LAG_SECONDS: float
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float
+
+    DB_POOL_SIZE: int
+    DB_MAX_OVERFLOW: int
+    DB_POOL_TIMEOUT_SECONDS: float
+    DB_POOL_RECYCLE_SECONDS: int
+    DB_POOL_PRE_PING: bool
+    DB_STATEMENT_TIMEOUT_MS: int
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int
 
     SERVER_HOST: str
     SERVER_PORT: int
+    SERVER_WORKERS: int
+    SERVER_RELOAD: bool
+    PROMETHEUS_MULTIPROC_DIR: str
+    LEADER_ELECTION_RETRY_SECONDS: int
 
     EVENT_PROVIDER_URL: str
     LMS_API_KEY: str
@@ -24,6 +39,33 @@ class Settings(BaseSettings):
     OUTBOX_MAX_RETRIES: int
     OUTBOX_EVENTS_LIFESPAN_HOURS: int
     IDEMPOTENCY_KEY_LIFESPAN_HOURS: int
+    EVENTS_COUNT_CACHE_TTL_SECONDS: int
+    EVENT_CACHE_TTL_SECONDS: int
+    EVENT_CACHE_MAXSIZE: int
+    SEATS_COALESCE_ACROSS_WORKERS: bool
+    SEATS_CACHE_TTL_SECONDS: int
+    SEATS_CACHE_STALE_WHILE_REVALIDATE: bool
+    SEATS_CACHE_HARD_EXPIRY_SECONDS: int
+    SEATS_REFRESH_TOP_N: int
+    SEATS_REFRESH_INTERVAL_SECONDS: int
+    EVENTS_PROVIDER_MAX_CONNECTIONS: int
+    EVENTS_PROVIDER_MAX_KEEPALIVE_CONNECTIONS: int
+    EVENTS_PROVIDER_KEEPALIVE_EXPIRY_SECONDS: float
+    EVENTS_PROVIDER_HTTP2: bool
+    OUTBOX_BATCH_SIZE: int
+    OUTBOX_DISPATCH_CONCURRENCY: int
+    OUTBOX_CLAIM_TIMEOUT_SECONDS: int
+    OUTBOX_LISTEN_ENABLED: bool
+    OUTBOX_POLL_INTERVAL_SECONDS: int
+    OUTBOX_MAINTENANCE_CHUNK_SIZE: int
+    EVENTS_CACHE_MAX_AGE_SECONDS: int
+    EVENTS_RESPONSE_CACHE_MAX_BYTES: int
+    METRICS_COLLECT_INTERVAL_SECONDS: int
+    SYNC_MODE: str
+    SYNC_PIPELINE_DEPTH: int
+    SYNC_BULK_LOADER: str
+    SYNC_PARALLEL_WINDOWS: int
+    SYNC_PARALLEL_CONCURRENCY: int
 
 
 class DevSettings(Settings):
@@ -35,6 +77,28 @@ class DevSettings(Settings):
     POSTGRES_DB_URL: str = os.getenv("POSTGRES_CONNECTION_STRING").replace(
         "postgres://", "postgresql+asyncpg://"
     )
+    # Optional streaming replica serving read-only event endpoints
+    POSTGRES_REPLICA_DB_URL: str | None = (
+        os.getenv("POSTGRES_REPLICA_CONNECTION_STRING", "").replace(
+            "postgres://", "postgresql+asyncpg://"
+        )
+        or None
+    )
+    # Reads fall back to primary while replica lags behind by more than this
+    REPLICA_MAX_LAG_SECONDS: float = os.getenv("REPLICA_MAX_LAG_SECONDS", 5)
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = os.getenv(
+        "REPLICA_LAG_CHECK_INTERVAL_SECONDS", 5
+    )
+
+    DB_POOL_SIZE: int = os.getenv("DB_POOL_SIZE", 5)
+    DB_MAX_OVERFLOW: int = os.getenv("DB_MAX_OVERFLOW", 10)
+    DB_POOL_TIMEOUT_SECONDS: float = os.getenv("DB_POOL_TIMEOUT_SECONDS", 30)
+    DB_POOL_RECYCLE_SECONDS: int = os.getenv("DB_POOL_RECYCLE_SECONDS", 1800)
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", True)
+    DB_STATEMENT_TIMEOUT_MS: int = os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000)
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = os.getenv(
+        "DB_IDLE_IN_TRANSACTION_TIMEOUT_MS", 60000
+    )
 
     SERVER_HOST: str = os.getenv(
         "STUDENT_MAKSIMKURBANOV_EVENTS_AGGREGATOR_WEB_SERVICE_HOST"
@@ -42,6 +106,12 @@ class DevSettings(Settings):
     SERVER_PORT: int = os.getenv(
         "STUDENT_MAKSIMKURBANOV_EVENTS_AGGREGATOR_WEB_SERVICE_PORT"
     )
+    SERVER_WORKERS: int = os.getenv("SERVER_WORKERS", 1)
+    SERVER_RELOAD: bool = os.getenv("SERVER_RELOAD", False)
+    PROMETHEUS_MULTIPROC_DIR: str = os.getenv(
+        "PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc"
+    )
+    LEADER_ELECTION_RETRY_SECONDS: int = os.getenv("LEADER_ELECTION_RETRY_SECONDS", 15)
 
     EVENT_PROVIDER_URL: str = os.getenv("EVENT_PROVIDER_URL")
     LMS_API_KEY: str = os.getenv("LMS_API_KEY")
@@ -50,6 +120,56 @@ class DevSettings(Settings):
     OUTBOX_MAX_RETRIES: int = os.getenv("OUTBOX_MAX_RETRIES")
     OUTBOX_EVENTS_LIFESPAN_HOURS: int = os.getenv("OUTBOX_EVENTS_LIFESPAN_HOURS")
     IDEMPOTENCY_KEY_LIFESPAN_HOURS: int = os.getenv("IDEMPOTENCY_KEY_LIFESPAN_HOURS")
+    EVENTS_COUNT_CACHE_TTL_SECONDS: int = os.getenv(
+        "EVENTS_COUNT_CACHE_TTL_SECONDS", 60
+    )
+    EVENT_CACHE_TTL_SECONDS: int = os.getenv("EVENT_CACHE_TTL_SECONDS", 300)
+    EVENT_CACHE_MAXSIZE: int = os.getenv("EVENT_CACHE_MAXSIZE", 10000)
+    SEATS_COALESCE_ACROSS_WORKERS: bool = os.getenv(
+        "SEATS_COALESCE_ACROSS_WORKERS", False
+    )
+    SEATS_CACHE_TTL_SECONDS: int = os.getenv("SEATS_CACHE_TTL_SECONDS", 30)
+    SEATS_CACHE_STALE_WHILE_REVALIDATE: bool = os.getenv(
+        "SEATS_CACHE_STALE_WHILE_REVALIDATE", False
+    )
+    SEATS_CACHE_HARD_EXPIRY_SECONDS: int = os.getenv(
+        "SEATS_CACHE_HARD_EXPIRY_SECONDS", 300
+    )
+    SEATS_REFRESH_TOP_N: int = os.getenv("SEATS_REFRESH_TOP_N", 0)
+    SEATS_REFRESH_INTERVAL_SECONDS: int = os.getenv(
+        "SEATS_REFRESH_INTERVAL_SECONDS", 20
+    )
+    EVENTS_PROVIDER_MAX_CONNECTIONS: int = os.getenv(
+        "EVENTS_PROVIDER_MAX_CONNECTIONS", 100
+    )
+    EVENTS_PROVIDER_MAX_KEEPALIVE_CONNECTIONS: int = os.getenv(
+        "EVENTS_PROVIDER_MAX_KEEPALIVE_CONNECTIONS", 20
+    )
+    EVENTS_PROVIDER_KEEPALIVE_EXPIRY_SECONDS: float = os.getenv(
+        "EVENTS_PROVIDER_KEEPALIVE_EXPIRY_SECONDS", 30
+    )
+    EVENTS_PROVIDER_HTTP2: bool = os.getenv("EVENTS_PROVIDER_HTTP2", False)
+    OUTBOX_BATCH_SIZE: int = os.getenv("OUTBOX_BATCH_SIZE", 50)
+    OUTBOX_DISPATCH_CONCURRENCY: int = os.getenv("OUTBOX_DISPATCH_CONCURRENCY", 10)
+    # Claimed batch is retried once claim runs out: must outlast its dispatch
+    OUTBOX_CLAIM_TIMEOUT_SECONDS: int = os.getenv("OUTBOX_CLAIM_TIMEOUT_SECONDS", 300)
+    OUTBOX_LISTEN_ENABLED: bool = os.getenv("OUTBOX_LISTEN_ENABLED", True)
+    OUTBOX_POLL_INTERVAL_SECONDS: int = os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", 30)
+    OUTBOX_MAINTENANCE_CHUNK_SIZE: int = os.getenv(
+        "OUTBOX_MAINTENANCE_CHUNK_SIZE", 1000
+    )
+    EVENTS_CACHE_MAX_AGE_SECONDS: int = os.getenv("EVENTS_CACHE_MAX_AGE_SECONDS", 60)
+    EVENTS_RESPONSE_CACHE_MAX_BYTES: int = os.getenv(
+        "EVENTS_RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024
+    )
+    METRICS_COLLECT_INTERVAL_SECONDS: int = os.getenv(
+        "METRICS_COLLECT_INTERVAL_SECONDS", 60
+    )
+    SYNC_MODE: str = os.getenv("SYNC_MODE", "sequential")
+    SYNC_PIPELINE_DEPTH: int = os.getenv("SYNC_PIPELINE_DEPTH", 2)
+    SYNC_BULK_LOADER: str = os.getenv("SYNC_BULK_LOADER", "copy")
+    SYNC_PARALLEL_WINDOWS: int = os.getenv("SYNC_PARALLEL_WINDOWS", 8)
+    SYNC_PARALLEL_CONCURRENCY: int = os.getenv("SYNC_PARALLEL_CONCURRENCY", 4)
 
 
 dev_settings = DevSettings()
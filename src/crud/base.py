@@ -1,12 +1,28 @@
-from datetime import date, datetime
-from json import JSONEncoder
+import json
 from typing import TypeVar
-from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import inspect, select, update, func
+from pydantic_core import to_json
+from sqlalchemy import (
+    JSON,
+    cast,
+    column,
+    delete,
+    inspect,
+    literal_column,
+    select,
+    table as sa_table,
+    text,
+    tuple_,
+    update,
+    func,
+    values,
+)
+from sqlalchemy.dialects.postgresql import JSONB, Insert
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
 from src.utils.log import get_logger
 
@@ -16,19 +32,47 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 log = get_logger(__name__)
 
+BULK_LOAD_CHUNK_SIZE = 10000
+# asyncpg limit of bind parameters in a single statement
+MAX_BIND_PARAMS = 32767
 
-old_default = JSONEncoder.default
 
+class UpsertResult:
+    """Outcome of a bulk upsert, split by what happened to every record"""
 
-def new_default(self, obj):
-    if isinstance(obj, UUID):
-        return str(obj)
-    if isinstance(obj, (datetime, date)):
-        return obj.isoformat()
-    return old_default(self, obj)
+    def __init__(self) -> None:
+        self.inserted: list[dict] = []
+        self.updated: list[dict] = []
+        self.unchanged: int = 0
 
+    @property
+    def changed(self) -> list[dict]:
+        """Primary Keys of inserted and updated records"""
+        return self.inserted + self.updated
 
-JSONEncoder.default = new_default
+    def add(self, id_cols: list[str], rows: list, total: int) -> None:
+        """
+        Account for rows returned by upsert of 'total' records, every row
+        holding Primary Key values followed by 'inserted' flag
+        """
+        for *pk_values, inserted in rows:
+            pk = dict(zip(id_cols, pk_values))
+            (self.inserted if inserted else self.updated).append(pk)
+        self.unchanged += total - len(rows)
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper for any selectable statement"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Executable) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kwargs)
 
 
 class CRUDRepository:
@@ -158,6 +202,94 @@ class CRUDRepository:
         result = await db.execute(stmt)
         return result.scalars().first()
 
+    async def bulk_update(self, db: AsyncSession, rows: list[dict], **kwargs) -> int:
+        """
+        Update multiple records in a single UPDATE ... FROM (VALUES ...)
+        statement. Every dict in rows must contain all Primary Key values and
+        the same set of columns to update, with per-row values.
+        kwargs are applied to every updated record alike.
+        Return number of updated records
+        """
+        if not rows:
+            return 0
+        table = self._model.__table__
+        col_names = list(rows[0])
+        data = values(
+            *(column(name, table.c[name].type) for name in col_names), name="data"
+        ).data([tuple(row[name] for name in col_names) for row in rows])
+        update_data = {
+            name: data.c[name] for name in col_names if name not in self.id_cols
+        }
+        log.debug(f"Bulk updating {len(rows)} records for {self._name}")
+        stmt = (
+            update(table)
+            .where(*(table.c[col] == data.c[col] for col in self.id_cols))
+            .values(**update_data, **kwargs)
+        )
+        result = await db.execute(stmt)
+        return result.rowcount
+
+    def _where_clauses(self, *args, limit: int | None = None, **kwargs) -> list:
+        """
+        Build WHERE clauses for set-based UPDATE and DELETE statements from
+        provided args and kwargs filtering. If limit is given, restrict them
+        to at most 'limit' matching records, skipping rows locked by other
+        transactions
+        Return list of SQL expressions
+        """
+        kwargs_clauses = [getattr(self._model, k) == v for k, v in kwargs.items()]
+        if limit is None:
+            return [*args, *kwargs_clauses]
+        pk_columns = [getattr(self._model, col) for col in self.id_cols]
+        target_pks = (
+            select(*pk_columns)
+            .filter(*args, *kwargs_clauses)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return [tuple_(*pk_columns).in_(target_pks)]
+
+    async def update_where(
+        self,
+        db: AsyncSession,
+        *args,
+        update_data: dict,
+        limit: int | None = None,
+        **kwargs,
+    ) -> int:
+        """
+        Update all records satisfying provided args and kwargs filtering
+        with update_data in a single statement, without loading them.
+        If limit is given, update at most 'limit' records, to let callers
+        process huge sets in short transactions
+        Return number of updated records
+        """
+        log.debug(f"Updating {self._name} records with data: {update_data}")
+        stmt = (
+            update(self._model.__table__)
+            .where(*self._where_clauses(*args, limit=limit, **kwargs))
+            .values(**update_data)
+        )
+        result = await db.execute(stmt)
+        return result.rowcount
+
+    async def delete_where(
+        self, db: AsyncSession, *args, limit: int | None = None, **kwargs
+    ) -> int:
+        """
+        Delete all records satisfying provided args and kwargs filtering
+        in a single statement, without loading them.
+        If limit is given, delete at most 'limit' records, to let callers
+        process huge sets in short transactions
+        Return number of deleted records
+        """
+        log.debug(f"Deleting {self._name} records")
+        stmt = delete(self._model.__table__).where(
+            *self._where_clauses(*args, limit=limit, **kwargs)
+        )
+        result = await db.execute(stmt)
+        return result.rowcount
+
     async def upsert(self, db: AsyncSession, obj_in: UpdateSchemaType) -> ORMModel:
         """
         Create a new record in database, on conflict (existing row with same
@@ -177,6 +309,131 @@ class CRUDRepository:
         pk_values = tuple(data[col] for col in self.id_cols)
         return await db.get(self._model, pk_values)
 
+    def _upsert_changed(self, stmt: Insert, col_names: list[str]) -> Insert:
+        """
+        Turn INSERT statement into an upsert based on Primary Key columns,
+        which only updates existing records if any of col_names differ from
+        incoming values, so that identical rows don't produce new row versions.
+        Statement returns Primary Key values of inserted and updated records,
+        along with 'inserted' flag (xmax of a freshly inserted row version is 0)
+        """
+        table = self._model.__table__
+        update_cols = [name for name in col_names if name not in self.id_cols]
+
+        def comparable(col):
+            # json type has no equality operator, compare it as jsonb
+            return cast(col, JSONB) if isinstance(col.type, JSON) else col
+
+        changed = tuple_(*(comparable(table.c[name]) for name in update_cols))
+        incoming = tuple_(*(comparable(stmt.excluded[name]) for name in update_cols))
+        return stmt.on_conflict_do_update(
+            index_elements=self.id_cols,
+            set_={name: stmt.excluded[name] for name in update_cols},
+            where=changed.is_distinct_from(incoming),
+        ).returning(
+            *(table.c[col] for col in self.id_cols),
+            literal_column(f"{table.name}.xmax = 0").label("inserted"),
+        )
+
+    async def bulk_upsert(
+        self, db: AsyncSession, objs_in: list[CreateSchemaType]
+    ) -> UpsertResult:
+        """
+        Perform a bulk upsert for multiple records, based on their
+        Primary Key columns (works for composite PKs as well).
+        On conflict (existing row with same Primary Key) update all
+        columns of a record except Primary Key with values passed in objs_in,
+        unless they are all equal to stored ones.
+        objs_in must contain all fields, including all Primary Key values.
+        Return UpsertResult
+        """
+        rows = [obj.model_dump() for obj in objs_in]
+        if not rows:
+            return UpsertResult()
+        cols = list(rows[0])
+        # Every row takes one bind parameter per column, chunk rows so that
+        # a single statement stays within the driver's limit
+        chunk_size = max(1, MAX_BIND_PARAMS // len(cols))
+
+        upserted = UpsertResult()
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            stmt = self._upsert_changed(pg_insert(self._model).values(chunk), cols)
+            result = await db.execute(stmt)
+            upserted.add(self.id_cols, result.all(), len(chunk))
+        return upserted
+
+    async def bulk_load(
+        self,
+        db: AsyncSession,
+        objs_in: list[CreateSchemaType],
+        chunk_size: int = BULK_LOAD_CHUNK_SIZE,
+    ) -> UpsertResult:
+        """
+        Upsert a large number of records, based on their Primary Key columns.
+        Records are streamed in chunks of 'chunk_size' with COPY into
+        a temporary staging table, then every chunk is merged into the target
+        table with a single INSERT ... SELECT ... ON CONFLICT DO UPDATE.
+        Staging table lives until the end of current transaction.
+        Records equal to already stored ones are left untouched.
+        If objs_in contain several records with the same Primary Key,
+        the last one wins.
+        Return UpsertResult
+        """
+        if not objs_in:
+            return UpsertResult()
+        rows = {}
+        for obj in objs_in:
+            row = obj.model_dump()
+            rows[tuple(row[col] for col in self.id_cols)] = row
+        rows = list(rows.values())
+
+        table = self._model.__table__
+        col_names = list(rows[0])
+        json_cols = {name for name in col_names if isinstance(table.c[name].type, JSON)}
+        staging_name = f"_staging_{table.name}"
+        staging = sa_table(staging_name, *(column(name) for name in col_names))
+
+        # CREATE TABLE AS doesn't copy NOT NULL constraints of target table,
+        # so rows missing server-defaulted columns can still be staged
+        await db.execute(text(f"DROP TABLE IF EXISTS {staging_name}"))
+        await db.execute(
+            text(
+                f"CREATE TEMP TABLE {staging_name} ON COMMIT DROP AS "
+                f"SELECT {', '.join(col_names)} FROM {table.name} WITH NO DATA"
+            )
+        )
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        stmt = self._upsert_changed(
+            pg_insert(table).from_select(
+                col_names, select(*(staging.c[name] for name in col_names))
+            ),
+            col_names,
+        )
+
+        upserted = UpsertResult()
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            log.debug(f"Bulk loading {len(chunk)} records for {self._name}")
+            await db.execute(text(f"TRUNCATE {staging_name}"))
+            await driver_connection.copy_records_to_table(
+                staging_name,
+                records=[
+                    tuple(
+                        to_json(row[name]).decode() if name in json_cols else row[name]
+                        for name in col_names
+                    )
+                    for row in chunk
+                ],
+                columns=col_names,
+            )
+            result = await db.execute(stmt)
+            upserted.add(self.id_cols, result.all(), len(chunk))
+        return upserted
+
     async def delete(self, db: AsyncSession, db_obj: ORMModel) -> None:
         """
         Delete an existing record from the database
@@ -187,6 +444,30 @@ class CRUDRepository:
         await db.delete(db_obj)
         return None
 
+    async def count_filtered(self, db: AsyncSession, *args, **kwargs) -> int | None:
+        """
+        Count records satisfying provided args and kwargs filtering
+        Return number of hits
+        """
+        filtering_stmt = select(self._model).filter(*args).filter_by(**kwargs)
+        count_stmt = select(func.count()).select_from(filtering_stmt.subquery())
+        result = await db.execute(count_stmt)
+        return result.scalars().one_or_none()
+
+    async def estimate_count(self, db: AsyncSession, *args, **kwargs) -> int:
+        """
+        Estimate number of records satisfying provided args and kwargs
+        filtering from query planner statistics, without scanning the table.
+        Accuracy depends on how recently the table was analyzed
+        Return estimated number of hits
+        """
+        stmt = select(self._model).filter(*args).filter_by(**kwargs)
+        result = await db.execute(Explain(stmt))
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     async def count_rows(self, db: AsyncSession, *args, **kwargs) -> int | None:
         stmt = select(func.count()).select_from(self._model.__table__)
         result = await db.execute(stmt)
@@ -1,10 +1,11 @@
-from sqlalchemy import func, select
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud.base import CRUDRepository, ORMModel
 from src.models.event import Event
-from src.schemas.event import EventCreate
 from src.utils.log import get_logger
 
 log = get_logger(__name__)
@@ -24,47 +25,65 @@ class EventsRepository(CRUDRepository):
     ) -> tuple[int, list[ORMModel]]:
         """
         Fetch all records satisfying provided args and kwargs filtering,
-        store number of hits in 'count' variable
+        along with total number of hits, in a single round trip: the count
+        is taken from a window function over the filtered rows of the bare
+        table, so that eagerly joined relationships are only loaded for rows
+        of the requested page rather than for every filtered row.
+        If requested page is past the last row, count is fetched separately.
         Respects given offset and limit.
         Return a tuple of count and events
         """
-        filtering_stmt = select(self._model).filter(*args).filter_by(**kwargs)
-        count_stmt = select(func.count()).select_from(filtering_stmt.subquery())
-        result = await db.execute(count_stmt)
-        count = result.scalars().one_or_none()
-        events = await self.get_many(
-            db, *args, order_by=order_by, offset=offset, limit=limit, **kwargs
+        page = (
+            select(self._model.id, func.count().over().label("total_count"))
+            .filter(*args)
+            .filter_by(**kwargs)
+            .order_by(order_by)
+            .offset(offset)
+            .limit(limit)
+            .subquery()
+        )
+        stmt = (
+            select(self._model, page.c.total_count)
+            .join(page, self._model.id == page.c.id)
+            .order_by(order_by)
         )
-        return count, events
+        result = await db.execute(stmt)
+        rows = result.all()
+        if rows:
+            return rows[0].total_count, [row[0] for row in rows]
+        count = await self.count_filtered(db, *args, **kwargs) if offset else 0
+        return count, []
 
-    async def bulk_upsert(
-        self, db: AsyncSession, objs_in: list[EventCreate]
-    ) -> list[dict]:
+    async def get_many_keyset(
+        self,
+        db: AsyncSession,
+        *args,
+        after: tuple[datetime, UUID] | None = None,
+        before: tuple[datetime, UUID] | None = None,
+        limit: int = 100,
+        **kwargs,
+    ) -> list[ORMModel]:
         """
-        Perform a bulk upsert for multiple events, based on their
-        Primary Key columns (works for composite PKs as well).
-        On conflict (existing row with same Primary Key) update all
-        columns of a record except Primary Key with values passed in objs_in.
-        objs_in must contain all fields, including all Primary Key values.
-        Return list of dicts containing pk_column:pk_value pairs,
-        representing updated rows (not full ORMModels, for brevity's sake).
+        Fetch records satisfying provided args and kwargs filtering, using
+        keyset pagination over (event_time, id): take up to 'limit' records
+        strictly after 'after' position, or strictly before 'before' position.
+        Unlike OFFSET, cost does not grow with depth of the position, as the
+        query is served by (event_time, id) index.
+        Return list of ORMModel objects in ascending (event_time, id) order
         """
-        rows = [obj.model_dump() for obj in objs_in]
-        table = self._model.__table__
-        pk_columns = [table.c[col_name] for col_name in self.id_cols]
-
-        stmt = pg_insert(self._model).values(rows)
-        update_data = {
-            col: getattr(stmt.excluded, col)
-            for col in rows[0]
-            if col not in self.id_cols
-        }
-        stmt = stmt.on_conflict_do_update(
-            index_elements=self.id_cols, set_=update_data
-        ).returning(*pk_columns)
-        result = await db.execute(stmt)
-
-        return [dict(zip(self.id_cols, row)) for row in result.all()]
+        keyset = tuple_(self._model.event_time, self._model.id)
+        stmt = select(self._model).filter(*args).filter_by(**kwargs)
+        if before is not None:
+            stmt = stmt.filter(keyset < before).order_by(
+                self._model.event_time.desc(), self._model.id.desc()
+            )
+        else:
+            if after is not None:
+                stmt = stmt.filter(keyset > after)
+            stmt = stmt.order_by(self._model.event_time, self._model.id)
+        result = await db.execute(stmt.limit(limit))
+        events = result.scalars().all()
+        return events[::-1] if before is not None else events
 
 
 events_crud = EventsRepository(model=Event)
@@ -1,8 +1,27 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.crud.base import CRUDRepository
 from src.models.outbox import Outbox
 from src.utils.log import get_logger
 
 log = get_logger(__name__)
 
+OUTBOX_NOTIFY_CHANNEL = "outbox_pending"
+
+
+class OutboxRepository(CRUDRepository):
+    """CRUD interface for Outbox model"""
+
+    async def notify_pending(self, db: AsyncSession) -> None:
+        """
+        Emit NOTIFY on outbox channel. Postgres delivers it to listeners
+        only when current transaction commits, and drops it on rollback
+        Return None
+        """
+        await db.execute(
+            text("SELECT pg_notify(:channel, '')"), {"channel": OUTBOX_NOTIFY_CHANNEL}
+        )
+
 
-outbox_crud = CRUDRepository(model=Outbox)
+outbox_crud = OutboxRepository(model=Outbox)
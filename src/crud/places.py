@@ -0,0 +1,4 @@
+from src.crud.base import CRUDRepository
+from src.models.place import Place
+
+places_crud = CRUDRepository(model=Place)
@@ -0,0 +1,4 @@
+from src.crud.base import CRUDRepository
+from src.models.sync_checkpoint import SyncCheckpoint
+
+sync_checkpoint_crud = CRUDRepository(model=SyncCheckpoint)
@@ -4,6 +4,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud.base import CRUDRepository
+from src.models.sync_checkpoint import SyncCheckpoint
 from src.models.sync_metadata import SyncMetadata
 
 
@@ -19,5 +20,21 @@ class SyncMetadataRepository(CRUDRepository):
         result = await db.execute(stmt)
         return result.scalars().one_or_none()
 
+    async def get_data_version(self, db: AsyncSession) -> datetime | None:
+        """
+        Fetch and return the latest of timestamp of the most recent sync,
+        successful or not, and time of the latest sync checkpoint. Sync
+        commits every page along with its checkpoint, so the result moves
+        on with every commit of event data, not only once sync finishes
+        """
+        stmt = select(
+            func.greatest(
+                select(func.max(self._model.sync_timestamp)).scalar_subquery(),
+                select(func.max(SyncCheckpoint.updated_at)).scalar_subquery(),
+            )
+        )
+        result = await db.execute(stmt)
+        return result.scalars().one_or_none()
+
 
 sync_crud = SyncMetadataRepository(model=SyncMetadata)
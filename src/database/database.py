@@ -1,6 +1,7 @@
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
+from pydantic_core import to_json
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -9,41 +10,89 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from src.config import dev_settings
+from src.database.pool_metrics import instrumented_pool_class, observe_pool
+from src.database.replica import ReplicaLagCheck, replica_fallbacks_total
 from src.utils.log import get_logger
 
 log = get_logger(__name__)
 
 
-def get_engine(database_url: str, echo: bool = False) -> AsyncEngine:
+def json_serializer(obj) -> str:
     """
-    Create and return a SQLAlchemy Engine object for connecting to a database
+    Serialize JSON column values with pydantic_core, which handles UUID
+    and datetime values found in schema dumps
+    """
+    return to_json(obj).decode()
+
+
+def get_engine(
+    database_url: str, echo: bool = False, name: str = "primary"
+) -> AsyncEngine:
+    """
+    Create and return a SQLAlchemy Engine object for connecting to a database.
+    Pool is sized by DB_POOL_* settings and instrumented with metrics
+    labelled by engine name. Every connection gets server-side
+    statement_timeout and idle_in_transaction_session_timeout
 
     Parameters:
         database_url (str): The URL of the database to connect to.
         Defaults to SQLALCHEMY_DATABASE_URL.
         echo (bool): Whether or not to enable echoing of SQL statements.
         Defaults to False.
+        name (str): Engine name used as metrics label.
 
     Returns:
         Engine: A SQLAlchemy Engine object representing the database connection.
     """
-    return create_async_engine(database_url, echo=echo, pool_pre_ping=True)
+    async_engine = create_async_engine(
+        database_url,
+        echo=echo,
+        poolclass=instrumented_pool_class(name),
+        pool_size=dev_settings.DB_POOL_SIZE,
+        max_overflow=dev_settings.DB_MAX_OVERFLOW,
+        pool_timeout=dev_settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=dev_settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=dev_settings.DB_POOL_PRE_PING,
+        json_serializer=json_serializer,
+        connect_args={
+            "server_settings": {
+                "statement_timeout": str(dev_settings.DB_STATEMENT_TIMEOUT_MS),
+                "idle_in_transaction_session_timeout": str(
+                    dev_settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS
+                ),
+            }
+        },
+    )
+    observe_pool(async_engine, name)
+    return async_engine
 
 
-def get_local_session(async_engine: AsyncEngine) -> async_sessionmaker:
+def get_local_session(
+    async_engine: AsyncEngine, replica: bool = False
+) -> async_sessionmaker:
     """
     Database session factory: create and return an async_sessionmaker object
 
     Parameters:
         async_engine (AsyncEngine): SQLAlchemy AsyncEngine object
+        replica (bool): Whether engine connects to read replica. Recorded
+        in session info, see is_replica_session.
     Returns:
         async_sessionmaker: An async_sessionmaker object
     """
     return async_sessionmaker(
-        bind=async_engine, autoflush=False, expire_on_commit=False
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        info={"replica": replica},
     )
 
 
+def is_replica_session(db: AsyncSession) -> bool:
+    """Return whether session reads from read replica, which may lag behind"""
+    return db.info.get("replica") is True
+
+
 async def get_db() -> AsyncGenerator[AsyncSession]:
     """
     Generator that yields a database session for operations
@@ -75,5 +124,63 @@ async def get_ctx_db() -> AsyncGenerator[AsyncSession]:
     log.debug("Closing database session")
 
 
+async def get_read_session_local() -> async_sessionmaker:
+    """
+    Pick session factory for read-only operations: replica one, if replica
+    is configured and its lag is within REPLICA_MAX_LAG_SECONDS, primary
+    one otherwise
+    """
+    if replica_lag_check is None:
+        return async_session_local
+    if await replica_lag_check.is_usable():
+        return replica_session_local
+    replica_fallbacks_total.inc()
+    return async_session_local
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession]:
+    """
+    Generator that yields a database session for read-only operations,
+    served by read replica when it is configured and fresh enough.
+    Data read through it may lag behind primary by up to
+    REPLICA_MAX_LAG_SECONDS, so nothing should be written through it
+
+    Yields:
+        AsyncSession: An AsyncSession object.
+    """
+    log.debug("Getting read-only database session")
+    session_local = await get_read_session_local()
+    async with session_local() as session:
+        yield session
+    log.debug("Closing read-only database session")
+
+
+@asynccontextmanager
+async def get_ctx_read_db() -> AsyncGenerator[AsyncSession]:
+    """
+    Async context manager that yields a database session for read-only
+    operations, served by read replica when it is configured and fresh
+    enough, like get_read_db does
+
+    Yields:
+        AsyncSession: An AsyncSession object.
+    """
+    log.debug("Getting read-only database session")
+    session_local = await get_read_session_local()
+    async with session_local() as session:
+        yield session
+    log.debug("Closing read-only database session")
+
+
 engine = get_engine(dev_settings.POSTGRES_DB_URL)
 async_session_local = get_local_session(engine)
+
+replica_engine = replica_session_local = replica_lag_check = None
+if dev_settings.POSTGRES_REPLICA_DB_URL:
+    replica_engine = get_engine(dev_settings.POSTGRES_REPLICA_DB_URL, name="replica")
+    replica_session_local = get_local_session(replica_engine, replica=True)
+    replica_lag_check = ReplicaLagCheck(
+        replica_engine,
+        max_lag=dev_settings.REPLICA_MAX_LAG_SECONDS,
+        check_interval=dev_settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+    )
@@ -0,0 +1,114 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+
+from prometheus_client import Gauge
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.utils.create_lock_key import create_lock_key
+from src.utils.log import get_logger
+
+log = get_logger(__name__)
+
+leader_elected = Gauge(
+    "leader_elected",
+    "Whether process currently holds leadership",
+    ["name"],
+    multiprocess_mode="livesum",
+)
+
+
+class LeaderElection:
+    """
+    Elect a single leader among all processes sharing the database:
+    leader holds session-level advisory lock on a dedicated autocommit
+    connection for as long as it leads, others retry acquiring it every
+    'retry_interval' seconds. Leadership is lost along with the connection,
+    so leader checks it periodically and steps down once it breaks.
+    on_elected and on_demoted are awaited on every change of leadership
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        name: str,
+        on_elected: Callable[[], Awaitable[None]],
+        on_demoted: Callable[[], Awaitable[None]],
+        retry_interval: float,
+    ) -> None:
+        self.engine = engine
+        self.name = name
+        self.lock_key = create_lock_key(f"leader:{name}")
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.retry_interval = retry_interval
+        self.is_leader = False
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start campaigning in background task"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop campaigning, stepping down if currently leading"""
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        """Campaign for leadership until cancelled"""
+        while True:
+            try:
+                async with self.engine.connect() as conn:
+                    conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                    if await self._try_lock(conn):
+                        await self._lead(conn)
+            except (OSError, SQLAlchemyError) as e:
+                log.warning(f"Leader election '{self.name}' failed: {e}")
+            except Exception:
+                # Keep campaigning whatever goes wrong in callbacks
+                log.exception(f"Leader election '{self.name}' failed unexpectedly")
+            await asyncio.sleep(self.retry_interval)
+
+    async def _try_lock(self, conn: AsyncConnection) -> bool:
+        result = await conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key}
+        )
+        return result.scalar()
+
+    async def _lead(self, conn: AsyncConnection) -> None:
+        """
+        Act as leader until connection holding the lock breaks or task is
+        cancelled. Lock is released explicitly, since connection goes back
+        to the pool rather than being closed
+        """
+        log.info(f"Elected as '{self.name}' leader")
+        self.is_leader = True
+        leader_elected.labels(name=self.name).set(1)
+        try:
+            await self.on_elected()
+            while True:
+                await asyncio.sleep(self.retry_interval)
+                await conn.execute(text("SELECT 1"))
+        finally:
+            self.is_leader = False
+            leader_elected.labels(name=self.name).set(0)
+            log.info(f"Stepping down as '{self.name}' leader")
+            await self._step_down(conn)
+
+    async def _step_down(self, conn: AsyncConnection) -> None:
+        """Run on_demoted and release the lock, dropping broken connection"""
+        try:
+            await self.on_demoted()
+        finally:
+            try:
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key}
+                )
+            except (OSError, SQLAlchemyError) as e:
+                log.warning(f"Failed to release '{self.name}' leadership lock: {e}")
+                await conn.invalidate()
@@ -0,0 +1,77 @@
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+db_pool_checkout_seconds = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a connection from the pool",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+db_pool_checkout_timeouts_total = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up waiting for a connection after pool_timeout",
+    ["engine"],
+)
+db_pool_connections = Gauge(
+    "db_pool_connections",
+    "Connections in the pool",
+    ["engine", "state"],
+    multiprocess_mode="livesum",
+)
+db_pool_overflow = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+db_pool_size = Gauge(
+    "db_pool_size",
+    "Configured number of persistent connections in the pool",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+
+def instrumented_pool_class(name: str) -> type[AsyncAdaptedQueuePool]:
+    """
+    Create pool class timing every checkout, including time spent waiting
+    for a free connection, and counting checkouts that timed out.
+    Name is kept on the class, so that pools recreated on dispose keep it
+    """
+
+    class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+        metrics_name = name
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                db_pool_checkout_timeouts_total.labels(engine=name).inc()
+                raise
+            finally:
+                db_pool_checkout_seconds.labels(engine=name).observe(
+                    time.perf_counter() - start
+                )
+
+    return InstrumentedQueuePool
+
+
+def observe_pool(engine: AsyncEngine, name: str) -> None:
+    """Keep pool utilisation gauges up to date on every checkout and checkin"""
+
+    def update(*args) -> None:
+        pool = engine.sync_engine.pool
+        checked_out = pool.checkedout()
+        db_pool_connections.labels(engine=name, state="checked_out").set(checked_out)
+        db_pool_connections.labels(engine=name, state="idle").set(pool.checkedin())
+        db_pool_overflow.labels(engine=name).set(max(0, pool.overflow()))
+
+    db_pool_size.labels(engine=name).set(engine.sync_engine.pool.size())
+    event.listen(engine.sync_engine, "checkout", update)
+    event.listen(engine.sync_engine, "checkin", update)
@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.utils.log import get_logger
+
+log = get_logger(__name__)
+
+replica_lag_seconds = Gauge(
+    "db_replica_lag_seconds",
+    "Replication lag of read replica as of the latest check",
+    multiprocess_mode="max",
+)
+replica_fallbacks_total = Counter(
+    "db_replica_fallbacks_total",
+    "Read-only sessions served by primary because replica lagged or failed",
+)
+
+# Replica that has replayed all WAL it received is up to date no matter how
+# long ago the last transaction was replayed: primary may just be idle.
+# Server that is not in recovery at all is a primary, so it has no lag
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+
+class ReplicaLagCheck:
+    """
+    Tell whether read replica is fresh enough to serve reads: its lag is
+    measured at most once every 'check_interval' seconds per process, with
+    concurrent callers sharing the same measurement. Replica is considered
+    unusable while its lag exceeds 'max_lag' seconds or cannot be measured
+    """
+
+    def __init__(
+        self, engine: AsyncEngine, max_lag: float, check_interval: float
+    ) -> None:
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.usable = False
+        self._checked_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def is_usable(self) -> bool:
+        """Return whether replica lag is within max_lag, re-checking if due"""
+        if not self._is_due():
+            return self.usable
+        async with self._lock:
+            if self._is_due():
+                self.usable = await self._check()
+                self._checked_at = time.monotonic()
+        return self.usable
+
+    def _is_due(self) -> bool:
+        return (
+            self._checked_at is None
+            or time.monotonic() - self._checked_at >= self.check_interval
+        )
+
+    async def _check(self) -> bool:
+        try:
+            async with self.engine.connect() as conn:
+                lag = (await conn.execute(REPLICA_LAG_QUERY)).scalar()
+        except (OSError, SQLAlchemyError) as e:
+            log.warning(f"Replica lag check failed: {e}")
+            return False
+        if lag is None:
+            log.warning("Replica lag is unknown: no transactions replayed yet")
+            return False
+        lag = float(lag)
+        replica_lag_seconds.set(lag)
+        if lag > self.max_lag:
+            log.warning(f"Replica lags behind by {lag:.1f}s, reading from primary")
+            return False
+        return True
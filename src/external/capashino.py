@@ -6,16 +6,27 @@ from src.utils.log import get_logger
 
 log = get_logger(__name__)
 
+CAPASHINO_TIMEOUT_SECONDS = 10
+
 
 class CapashinoClient:
-    """Interface for interacting with Capashino API"""
+    """
+    Interface for interacting with Capashino API.
+    Meant to be long-lived: connection pool is sized to serve
+    OUTBOX_DISPATCH_CONCURRENCY concurrent notifications over keep-alive
+    connections
+    """
 
     def __init__(self):
         self.base_url = dev_settings.CAPASHINO_URL
         self.api_key = dev_settings.LMS_API_KEY
+        concurrency = dev_settings.OUTBOX_DISPATCH_CONCURRENCY
         self.client = httpx.AsyncClient(
-            timeout=10,
+            timeout=CAPASHINO_TIMEOUT_SECONDS,
             headers={"x-api-key": self.api_key},
+            limits=httpx.Limits(
+                max_connections=concurrency, max_keepalive_connections=concurrency
+            ),
             event_hooks={"request": [self._log_request]},
         )
 
@@ -40,4 +51,8 @@ class CapashinoClient:
         return self
 
     async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close underlying httpx client along with its connection pool"""
         await self.client.aclose()
@@ -1,10 +1,12 @@
+import importlib.util
 import re
 import time
 from datetime import datetime
 from typing import Any
 
 import httpx
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
+from pydantic_core import to_jsonable_python
 
 from src.config import dev_settings
 from src.utils.log import get_logger
@@ -19,6 +21,17 @@ events_provider_request_duration_seconds = Histogram(
     "Outgoing request duration",
     ["endpoint"],
 )
+events_provider_pool_connections = Gauge(
+    "events_provider_pool_connections",
+    "Connections in Events Provider client pool",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+events_provider_pool_max_connections = Gauge(
+    "events_provider_pool_max_connections",
+    "Maximum number of connections in Events Provider client pool",
+    multiprocess_mode="livesum",
+)
 
 
 class BaseEventsProviderClient:
@@ -89,10 +102,27 @@ class BaseEventsProviderClient:
         log.debug("Normalized URL: %s", normalized_url)
         return normalized_url
 
+    def _observe_pool(self) -> None:
+        """
+        Update connection pool gauges from httpx transport state.
+        Pool internals are not public API, so missing attributes are ignored
+        """
+        try:
+            connections = self.client._transport._pool.connections
+        except AttributeError:
+            return
+        idle = sum(1 for connection in connections if connection.is_idle())
+        events_provider_pool_connections.labels(state="idle").set(idle)
+        events_provider_pool_connections.labels(state="active").set(
+            len(connections) - idle
+        )
+
     async def _outgoing_request_hook(self, request: httpx.Request):
         request.extensions["start_time"] = time.monotonic()
+        self._observe_pool()
 
     async def _outgoing_response_hook(self, response: httpx.Response):
+        self._observe_pool()
         start = response.request.extensions.get("start_time")
         if start:
             endpoint = self._normalize_url(str(response.request.url))
@@ -107,18 +137,44 @@ class BaseEventsProviderClient:
 
 
 class EventsProviderClient(BaseEventsProviderClient):
-    """Async client for interaction with Events Provider API"""
+    """
+    Async client for interaction with Events Provider API.
+    Meant to be long-lived and shared: it keeps a pool of keep-alive
+    connections, so that requests do not pay for new TCP and TLS handshakes
+    """
 
     def __init__(self) -> None:
         super().__init__()
+        limits = httpx.Limits(
+            max_connections=dev_settings.EVENTS_PROVIDER_MAX_CONNECTIONS,
+            max_keepalive_connections=(
+                dev_settings.EVENTS_PROVIDER_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=dev_settings.EVENTS_PROVIDER_KEEPALIVE_EXPIRY_SECONDS,
+        )
         self.client = httpx.AsyncClient(
             timeout=self.timeout,
             headers=self._get_headers(),
+            limits=limits,
+            http2=self._http2_enabled(),
             event_hooks={
                 "request": [self._log_request, self._outgoing_request_hook],
                 "response": [self._outgoing_response_hook],
             },
         )
+        events_provider_pool_max_connections.set(limits.max_connections)
+
+    def _http2_enabled(self) -> bool:
+        """
+        Determine if HTTP/2 should be used: it is opt-in and requires
+        optional 'h2' package (httpx[http2])
+        """
+        if not dev_settings.EVENTS_PROVIDER_HTTP2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            log.warning("HTTP/2 requested, but 'h2' is not installed: using HTTP/1.1")
+            return False
+        return True
 
     async def get_events(
         self, changed_at: datetime, next_url: str | None = None
@@ -142,7 +198,9 @@ class EventsProviderClient(BaseEventsProviderClient):
     async def register(self, event_id, **kwargs) -> dict[str, Any]:
         """Buy ticket from the Events Provider"""
         return await self._perform_request(
-            self.client.post(self._build_url(event_id, "register"), json=kwargs),
+            self.client.post(
+                self._build_url(event_id, "register"), json=to_jsonable_python(kwargs)
+            ),
             "Register",
         )
 
@@ -153,7 +211,9 @@ class EventsProviderClient(BaseEventsProviderClient):
         """
         return await self._perform_request(
             self.client.request(
-                "DELETE", self._build_url(event_id, "unregister"), json=kwargs
+                "DELETE",
+                self._build_url(event_id, "unregister"),
+                json=to_jsonable_python(kwargs),
             ),
             "Unregister",
         )
@@ -172,5 +232,9 @@ class EventsProviderClient(BaseEventsProviderClient):
         return self
 
     async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close underlying httpx client along with its connection pool"""
         log.debug("Closing events provider httpx client")
         await self.client.aclose()
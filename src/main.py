@@ -1,8 +1,10 @@
-import asyncio
+import os
+import shutil
 from contextlib import asynccontextmanager
+from datetime import UTC, datetime
 
 import sentry_sdk
-from prometheus_client import start_http_server
+from prometheus_client import multiprocess
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 import uvicorn
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -21,9 +23,20 @@ from src.api.routes.metrics import metrics_router
 from src.api.routes.sync import sync_router
 from src.api.routes.tickets import ticket_router
 from src.config import dev_settings
-from src.database.database import get_ctx_db, engine
+from src.database.database import get_ctx_db, engine, replica_engine
+from src.database.leader_election import LeaderElection
+from src.external.capashino import CapashinoClient
+from src.external.events_provider import EventsProviderClient
 from src.middleware.metrics_middleware import MetricsMiddleware
+from src.services.cache_invalidation import CacheInvalidationListener
+from src.services.event_service import (
+    invalidate_event_caches,
+    refresh_popular_seats,
+)
+from src.services.metrics_service import collect_business_metrics
 from src.services.outbox_service import (
+    OutboxListener,
+    check_outbox_claim_timeout,
     outbox_process_events,
     outbox_reset_failed_events,
     outbox_delete_old_events,
@@ -33,26 +46,33 @@ from src.utils.log import get_logger
 from src.services.sync_service import do_sync
 
 log = get_logger(__name__)
+# Jobs that must run in a single process: started only in elected leader
 scheduler = AsyncIOScheduler()
+# Jobs acting on process-local state: run in every worker process
+local_scheduler = AsyncIOScheduler()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.state.engine = engine
+    provider_client = EventsProviderClient()
+    app.state.events_provider_client = provider_client
+    capashino_client = CapashinoClient()
 
     scheduler.add_job(
         do_sync,
         CronTrigger(hour=2, minute=0),
         max_instances=1,
-        args=["scheduled", get_ctx_db],
+        args=["scheduled", get_ctx_db, provider_client],
         id="events_sync",
         replace_existing=True,
     )
     scheduler.add_job(
         outbox_process_events,
         "interval",
-        seconds=5,
+        seconds=dev_settings.OUTBOX_POLL_INTERVAL_SECONDS,
         max_instances=1,
+        args=[capashino_client],
         id="outbox_process_events",
         replace_existing=True,
     )
@@ -71,11 +91,65 @@ async def lifespan(app: FastAPI):
         id="outbox_delete_old_events",
         replace_existing=True,
     )
-    scheduler.start()
-    log.info("Scheduler started")
+    if dev_settings.SEATS_REFRESH_TOP_N > 0:
+        local_scheduler.add_job(
+            refresh_popular_seats,
+            "interval",
+            seconds=dev_settings.SEATS_REFRESH_INTERVAL_SECONDS,
+            max_instances=1,
+            args=[provider_client],
+            id="refresh_popular_seats",
+            replace_existing=True,
+        )
+    scheduler.add_job(
+        collect_business_metrics,
+        "interval",
+        seconds=dev_settings.METRICS_COLLECT_INTERVAL_SECONDS,
+        max_instances=1,
+        next_run_time=datetime.now(UTC),
+        misfire_grace_time=None,
+        id="collect_business_metrics",
+        replace_existing=True,
+    )
+    check_outbox_claim_timeout()
+    outbox_listener = OutboxListener(capashino_client)
+
+    async def on_elected() -> None:
+        scheduler.resume()
+        log.info("Scheduler resumed")
+        if dev_settings.OUTBOX_LISTEN_ENABLED:
+            outbox_listener.start()
+
+    async def on_demoted() -> None:
+        scheduler.pause()
+        log.info("Scheduler paused")
+        await outbox_listener.stop()
+
+    scheduler.start(paused=True)
+    local_scheduler.start()
+    leader_election = LeaderElection(
+        engine,
+        "scheduler",
+        on_elected=on_elected,
+        on_demoted=on_demoted,
+        retry_interval=dev_settings.LEADER_ELECTION_RETRY_SECONDS,
+    )
+    leader_election.start()
+    # Sync runs in a single process: others learn what it changed from NOTIFY
+    cache_invalidation_listener = CacheInvalidationListener(invalidate_event_caches)
+    cache_invalidation_listener.start()
     yield
+    await cache_invalidation_listener.stop()
+    await leader_election.stop()
     scheduler.shutdown()
+    local_scheduler.shutdown()
+    await provider_client.aclose()
+    await capashino_client.aclose()
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
 
 
 sentry_sdk.init(
@@ -99,14 +173,36 @@ app.include_router(ticket_router)
 app.include_router(metrics_router)
 
 
-async def main():
-    start_http_server(9090)
-    config = uvicorn.Config(
-        app=app, host="0.0.0.0", port=dev_settings.SERVER_PORT, reload=True
+def prepare_multiprocess_metrics() -> None:
+    """
+    Point prometheus_client of worker processes to a clean shared directory,
+    so that metrics of all workers are aggregated on scrape. Has to happen
+    before workers import prometheus_client
+    """
+    path = dev_settings.PROMETHEUS_MULTIPROC_DIR
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+
+
+def main():
+    """
+    Serve application: with SERVER_WORKERS > 1, in as many worker processes,
+    aggregating metrics through prometheus_client multiprocess mode.
+    SERVER_RELOAD enables reloader for development, in a single process
+    """
+    workers = dev_settings.SERVER_WORKERS
+    reload = dev_settings.SERVER_RELOAD
+    if workers > 1 and not reload:
+        prepare_multiprocess_metrics()
+    uvicorn.run(
+        "src.main:app",
+        host="0.0.0.0",
+        port=dev_settings.SERVER_PORT,
+        workers=None if reload else workers,
+        reload=reload,
     )
-    server = uvicorn.Server(config)
-    await server.serve()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
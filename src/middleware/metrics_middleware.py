@@ -1,9 +1,11 @@
 import time
 
-from fastapi import Request
-from prometheus_client import Counter, Histogram
-from starlette.middleware.base import BaseHTTPMiddleware
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+# Label for requests that matched no route, so that arbitrary URLs don't
+# produce new label values
+UNMATCHED_ENDPOINT = "<unmatched>"
 
 http_requests_total = Counter(
     "http_requests_total", "Total requests", ["method", "endpoint", "status"]
@@ -11,29 +13,88 @@ http_requests_total = Counter(
 http_request_duration_seconds = Histogram(
     "http_request_duration_seconds", "Request duration", ["method", "endpoint"]
 )
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "Requests being processed",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+http_response_size_bytes = Histogram(
+    "http_response_size_bytes",
+    "Response body size",
+    ["method", "endpoint"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+
+
+class MetricsMiddleware:
+    """
+    Raw ASGI middleware recording request count, duration, response size
+    and requests in progress. Endpoint label is the template of the matched
+    route. Labelled child metrics are cached, so that recording a request
+    takes a few dict lookups. Response is passed through untouched,
+    including streamed bodies
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._in_progress: dict[str, Gauge] = {}
+        self._requests: dict[tuple[str, str, int], Counter] = {}
+        self._timings: dict[tuple[str, str], tuple[Histogram, Histogram]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress = self._in_progress.get(method)
+        if in_progress is None:
+            in_progress = http_requests_in_progress.labels(method=method)
+            self._in_progress[method] = in_progress
 
+        status = 500
+        size = 0
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.monotonic()
-        response = await call_next(request)
-        duration = time.monotonic() - start_time
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
 
-        route = request.scope.get("route")
-        if route and hasattr(route, "path"):
-            endpoint = route.path
-        else:
-            endpoint = request.url.path
+        in_progress.inc()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start_time
+            in_progress.dec()
+            self._observe(scope, method, status, duration, size)
 
-        http_requests_total.labels(
-            method=request.method,
-            endpoint=endpoint,
-            status=response.status_code,
-        ).inc()
+    def _observe(
+        self, scope: Scope, method: str, status: int, duration: float, size: int
+    ) -> None:
+        """Record finished request in cached labelled child metrics"""
+        # Router stores matched route in scope, its path is a template
+        endpoint = getattr(scope.get("route"), "path", UNMATCHED_ENDPOINT)
 
-        http_request_duration_seconds.labels(
-            method=request.method,
-            endpoint=endpoint,
-        ).observe(duration)
+        requests = self._requests.get((method, endpoint, status))
+        if requests is None:
+            requests = http_requests_total.labels(
+                method=method, endpoint=endpoint, status=status
+            )
+            self._requests[method, endpoint, status] = requests
+        requests.inc()
 
-        return response
+        timings = self._timings.get((method, endpoint))
+        if timings is None:
+            timings = (
+                http_request_duration_seconds.labels(method=method, endpoint=endpoint),
+                http_response_size_bytes.labels(method=method, endpoint=endpoint),
+            )
+            self._timings[method, endpoint] = timings
+        duration_histogram, size_histogram = timings
+        duration_histogram.observe(duration)
+        size_histogram.observe(size)
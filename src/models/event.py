@@ -1,13 +1,13 @@
 from datetime import datetime
-from typing import Any
 from uuid import UUID
 
-from sqlalchemy import JSON, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String
 from sqlalchemy import DateTime as saDateTime
 from sqlalchemy.dialects.postgresql import UUID as pg_uuid
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base_class import Base
+from src.models.place import Place
 
 
 class Event(Base):
@@ -15,7 +15,7 @@ class Event(Base):
 
     id: Mapped[UUID] = mapped_column(pg_uuid, primary_key=True)
     name: Mapped[str] = mapped_column(String)
-    place: Mapped[dict[str, Any]] = mapped_column(JSON)
+    place_id: Mapped[UUID] = mapped_column(pg_uuid, ForeignKey("place.id"), index=True)
     event_time: Mapped[datetime] = mapped_column(saDateTime(timezone=True))
     registration_deadline: Mapped[datetime] = mapped_column(saDateTime(timezone=True))
     status: Mapped[str] = mapped_column(String)
@@ -23,3 +23,16 @@ class Event(Base):
     changed_at: Mapped[datetime] = mapped_column(saDateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(saDateTime(timezone=True))
     status_changed_at: Mapped[datetime] = mapped_column(saDateTime(timezone=True))
+
+    place: Mapped[Place] = relationship(lazy="joined", innerjoin=True)
+
+    __table_args__ = (
+        Index("ix_event_event_time_id", "event_time", "id"),
+        Index("ix_event_status_event_time", "status", "event_time"),
+        Index(
+            "ix_event_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
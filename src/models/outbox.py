@@ -40,12 +40,21 @@ class Outbox(Base):
         server_default=func.timezone("UTC", func.now()),
         server_onupdate=func.timezone("UTC", func.now()),
     )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        saDateTime(timezone=True), server_default=func.now()
+    )
 
     __table_args__ = (
         Index(
             "ix_outbox_status",
             "status",
+            "next_attempt_at",
             "created_at",
             postgresql_where=text("status = 'PENDING'"),
         ),
+        Index(
+            "ix_outbox_sent_updated_at",
+            "updated_at",
+            postgresql_where=text("status = 'SENT'"),
+        ),
     )
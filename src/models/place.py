@@ -14,7 +14,7 @@ class Place(Base):
 
     id: Mapped[UUID] = mapped_column(pg_uuid, primary_key=True)
     name: Mapped[str] = mapped_column(String)
-    city: Mapped[str] = mapped_column(String)
+    city: Mapped[str] = mapped_column(String, index=True)
     address: Mapped[str] = mapped_column(String)
     seats_pattern: Mapped[str] = mapped_column(String)
     changed_at: Mapped[datetime] = mapped_column(saDateTime(timezone=True))
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime as saDateTime
+from sqlalchemy import Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base_class import Base
+
+
+class SyncCheckpoint(Base):
+    __tablename__ = "sync_checkpoint"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    start_changed_at: Mapped[datetime] = mapped_column(saDateTime(timezone=True))
+    next_url: Mapped[str] = mapped_column(String, nullable=True)
+    page_max: Mapped[datetime] = mapped_column(saDateTime(timezone=True))
+    pages_synced: Mapped[int] = mapped_column(Integer)
+    events_synced: Mapped[int] = mapped_column(Integer)
+    events_inserted: Mapped[int] = mapped_column(Integer, server_default="0")
+    events_updated: Mapped[int] = mapped_column(Integer, server_default="0")
+    events_unchanged: Mapped[int] = mapped_column(Integer, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        saDateTime(timezone=True), server_default=func.timezone("UTC", func.now())
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field, HttpUrl, StringConstraints
@@ -11,9 +11,8 @@ class Event(BaseModel):
     pass
 
 
-class EventUpdate(BaseModel):
+class EventBase(BaseModel):
     name: str
-    place: PlaceUpdate
     event_time: datetime
     registration_deadline: datetime
     status: str
@@ -24,15 +23,35 @@ class EventUpdate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class EventUpdate(EventBase):
+    place: PlaceUpdate
+
+
 class EventCreate(EventUpdate):
     id: UUID
     created_at: datetime
 
 
+class EventRecord(EventBase):
+    """Row of event table: place is stored separately and referenced by ID"""
+
+    id: UUID
+    place_id: UUID
+    created_at: datetime
+
+
 class PaginatedEventsRequest(BaseModel):
     date_from: str = Field("2000-01-01", pattern=r"^\d{4}-\d{2}-\d{2}$")
+    date_to: str | None = Field(None, pattern=r"^\d{4}-\d{2}-\d{2}$")
+    status: str | None = Field(None, max_length=32)
+    city: str | None = Field(None, max_length=128)
+    place_id: UUID | None = None
+    name: str | None = Field(None, min_length=1, max_length=128)
     page: int = Field(1, ge=1)
     page_size: int = Field(20, ge=1)
+    pagination: Literal["page", "cursor"] = "page"
+    cursor: str | None = Field(None, max_length=512)
+    count: Literal["exact", "approximate"] = "exact"
 
 
 class PaginatedEventsResponse(BaseModel):
@@ -14,6 +14,7 @@ class OutboxInDB(BaseModel):
     status: OutboxStatus
     created_at: datetime
     updated_at: datetime
+    next_attempt_at: datetime
 
 
 class OutboxCreate(BaseModel):
@@ -24,3 +25,4 @@ class OutboxCreate(BaseModel):
 class OutboxUpdate(BaseModel):
     status: OutboxStatus | None = None
     retry_count: int | None = Field(default=0, ge=0)
+    next_attempt_at: datetime | None = None
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class SyncCheckpointUpdate(BaseModel):
+    name: str
+    start_changed_at: datetime
+    next_url: str | None
+    page_max: datetime
+    pages_synced: int
+    events_synced: int
+    events_inserted: int
+    events_updated: int
+    events_unchanged: int
+    updated_at: datetime
@@ -0,0 +1,131 @@
+import asyncio
+import json
+from collections.abc import Callable, Iterable
+from contextlib import suppress
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import dev_settings
+from src.utils.log import get_logger
+
+log = get_logger(__name__)
+
+CACHE_INVALIDATION_CHANNEL = "events_cache_invalidation"
+# Postgres rejects NOTIFY payloads of 8000 bytes and longer
+MAX_PAYLOAD_BYTES = 7900
+LISTENER_RECONNECT_DELAY = 5
+LISTENER_HEALTHCHECK_INTERVAL = 10
+
+
+def encode_invalidation(event_ids: Iterable, place_ids: Iterable) -> str:
+    """
+    Encode IDs of changed events and places as NOTIFY payload. Payload
+    that would not fit into NOTIFY is replaced by one dropping all events
+    """
+    payload = json.dumps({
+        "events": [str(event_id) for event_id in event_ids],
+        "places": [str(place_id) for place_id in place_ids],
+    })
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        return json.dumps({"all": True})
+    return payload
+
+
+def decode_invalidation(payload: str) -> tuple[list[UUID] | None, list[UUID]]:
+    """
+    Decode payload created by encode_invalidation.
+    Return tuple of event IDs, or None if all events changed, and place IDs.
+    Raise ValueError if payload is malformed
+    """
+    try:
+        data = json.loads(payload)
+        if data.get("all"):
+            return None, []
+        return (
+            [UUID(event_id) for event_id in data["events"]],
+            [UUID(place_id) for place_id in data["places"]],
+        )
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Malformed cache invalidation payload: {payload}") from e
+
+
+async def notify_cache_invalidation(
+    db: AsyncSession, event_ids: Iterable, place_ids: Iterable
+) -> None:
+    """
+    Emit NOTIFY on cache invalidation channel with IDs of changed events
+    and places. Postgres delivers it to listeners in all processes only
+    when current transaction commits, and drops it on rollback
+    Return None
+    """
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {
+            "channel": CACHE_INVALIDATION_CHANNEL,
+            "payload": encode_invalidation(event_ids, place_ids),
+        },
+    )
+
+
+class CacheInvalidationListener:
+    """
+    Keep process-local event caches consistent with other processes, by
+    listening to cache invalidation NOTIFY on a dedicated asyncpg
+    connection and passing IDs from every notification to on_invalidate.
+    Notifications sent while listener was disconnected are lost, so all
+    events are dropped every time listener (re)connects
+    """
+
+    def __init__(
+        self, on_invalidate: Callable[[list[UUID] | None, list[UUID]], None]
+    ) -> None:
+        self.on_invalidate = on_invalidate
+        self.dsn = dev_settings.POSTGRES_DB_URL.replace(
+            "postgresql+asyncpg://", "postgresql://"
+        )
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start listening in background task"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close connection"""
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            event_ids, place_ids = decode_invalidation(payload)
+        except ValueError as e:
+            log.warning(f"{e}, dropping all cached events")
+            event_ids, place_ids = None, []
+        self.on_invalidate(event_ids, place_ids)
+
+    async def _run(self) -> None:
+        """Keep listener connection open, reconnecting on failures"""
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.dsn)
+                await conn.add_listener(CACHE_INVALIDATION_CHANNEL, self._on_notify)
+                log.info(f"Listening to {CACHE_INVALIDATION_CHANNEL} notifications")
+                self.on_invalidate(None, [])
+                while True:
+                    await asyncio.sleep(LISTENER_HEALTHCHECK_INTERVAL)
+                    await conn.execute("SELECT 1")
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                log.warning(f"Cache invalidation listener failed: {e}")
+            except Exception:
+                log.exception("Cache invalidation listener failed unexpectedly")
+            finally:
+                if conn is not None:
+                    with suppress(OSError, asyncpg.PostgresError, TimeoutError):
+                        await conn.close()
+            await asyncio.sleep(LISTENER_RECONNECT_DELAY)
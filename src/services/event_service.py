@@ -1,14 +1,25 @@
+import asyncio
+import re
+from collections import Counter as RequestsCounter
+from collections.abc import Hashable, Iterable
 from datetime import UTC, datetime, timedelta
+from urllib.parse import urlencode
 from uuid import UUID
 
-from prometheus_client import Counter
+from prometheus_client import Counter, Histogram
+from sqlalchemy import inspect, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.routes.exceptions import EntityNotFoundError, EntityBadDataError
+from src.config import dev_settings
+from src.crud.base import ORMModel
 from src.crud.events import events_crud
 from src.crud.seats_cache import seats_cache_crud
+from src.crud.sync_metadata import sync_crud
+from src.database.database import async_session_local, is_replica_session
 from src.external.events_provider import EventsProviderClient
 from src.models.event import Event
+from src.models.place import Place
 from src.models.seats_cache import EventSeatsCache
 from src.schemas.event import (
     PaginatedEventsResponse,
@@ -17,14 +28,111 @@ from src.schemas.event import (
     EventSeatsResponse,
     SingleEventResponse,
 )
+from src.utils.bytes_cache import BytesLRUCache
+from src.utils.create_lock_key import create_lock_key
+from src.utils.cursor import decode_cursor, encode_cursor
 from src.utils.datetime_converter import str_to_dt_utc
 from src.utils.log import get_logger
+from src.utils.single_flight import SingleFlight
+from src.utils.ttl_cache import TTLCache
 
 log = get_logger(__name__)
 
 
 cache_hits_total = Counter("cache_hits_total", "Cache hits")
 cache_misses_total = Counter("cache_misses_total", "Cache misses")
+event_cache_hits_total = Counter("event_cache_hits_total", "Event cache hits")
+event_cache_misses_total = Counter("event_cache_misses_total", "Event cache misses")
+events_response_cache_hits_total = Counter(
+    "events_response_cache_hits_total", "Events listing response cache hits"
+)
+events_response_cache_misses_total = Counter(
+    "events_response_cache_misses_total", "Events listing response cache misses"
+)
+seats_requests_coalesced_total = Counter(
+    "seats_requests_coalesced_total",
+    "Seats cache misses served by provider call already in flight",
+)
+
+seats_cache_age_seconds = Histogram(
+    "seats_cache_age_seconds",
+    "Age of seats cache entries served to clients",
+    buckets=(1, 5, 10, 20, 30, 60, 120, 300, 600),
+)
+seats_cache_staleness_seconds = Histogram(
+    "seats_cache_staleness_seconds",
+    "Time past TTL of stale seats cache entries served while revalidating",
+    buckets=(1, 5, 10, 20, 30, 60, 120, 300, 600),
+)
+
+SEATS_CACHE_TTL = timedelta(seconds=dev_settings.SEATS_CACHE_TTL_SECONDS)
+SEATS_CACHE_HARD_EXPIRY = timedelta(
+    seconds=dev_settings.SEATS_CACHE_HARD_EXPIRY_SECONDS
+)
+
+# In-flight provider seats lookups, keyed by event ID
+seats_single_flight = SingleFlight()
+# Seats requests per event since last run of refresh_popular_seats
+seats_requests_counter = RequestsCounter()
+# Strong references to fire-and-forget revalidation tasks
+background_tasks = set()
+
+# Total counts of filtered events, keyed by count mode and filter values.
+# Event data only changes on sync, which clears the cache after commit
+events_count_cache = TTLCache(
+    maxsize=1024, ttl=dev_settings.EVENTS_COUNT_CACHE_TTL_SECONDS
+)
+# Detached copies of Event rows, keyed by event ID. Sync invalidates
+# entries for upserted events after commit
+event_cache = TTLCache(
+    maxsize=dev_settings.EVENT_CACHE_MAXSIZE, ttl=dev_settings.EVENT_CACHE_TTL_SECONDS
+)
+
+# Serialized events listing responses, keyed by data version, base URL and
+# normalized query parameters. Sync clears it after commit
+events_response_cache = BytesLRUCache(
+    max_bytes=dev_settings.EVENTS_RESPONSE_CACHE_MAX_BYTES
+)
+
+
+def invalidate_event_caches(
+    event_ids: Iterable | None, place_ids: Iterable = ()
+) -> None:
+    """
+    Drop cached data made stale by committed sync of given events and
+    places: cached events embed their place, so events at changed places
+    are dropped as well. event_ids of None drops all cached events
+    """
+    events_count_cache.clear()
+    events_response_cache.clear()
+    if event_ids is None:
+        event_cache.clear()
+        return
+    event_cache.invalidate(event_ids)
+    place_ids = set(place_ids)
+    if place_ids:
+        event_cache.invalidate_where(lambda event: event.place_id in place_ids)
+
+
+def detached_copy(obj: ORMModel) -> ORMModel:
+    """
+    Create a transient copy of ORM object with all column attributes loaded,
+    not bound to any session
+    """
+    model = type(obj)
+    return model(**{
+        attr.key: getattr(obj, attr.key) for attr in inspect(model).column_attrs
+    })
+
+
+def detached_event_copy(event: Event) -> Event:
+    """
+    Create a transient copy of Event along with its Place, not bound to any
+    session, so it can be safely shared across requests
+    """
+    event_copy = detached_copy(event)
+    event_copy.place = detached_copy(event.place)
+    return event_copy
 
 
 class EventService:
@@ -32,57 +140,251 @@ class EventService:
 
     def __init__(self, db: AsyncSession):
         self.db = db
+        # Rows read from lagging replica may predate the latest sync, so
+        # they must not be cached for everyone, primary readers included
+        self.populate_caches = not is_replica_session(db)
 
-    def _build_full_url(self, base_url: str, query_params: dict) -> str:
+    def _build_page_url(self, base_url: str, query_params: dict, page: int) -> str:
         """
-        Build complete URL string with trailing slash and query parameters
+        Build complete URL string for page number pagination mode: query
+        parameters are kept as given, with page number replaced
         """
         if not base_url.endswith("/"):
             base_url = base_url + "/"
-        query_params.setdefault("page", 1)
-        query_params_str = "?" + "&".join(f"{k}={v}" for k, v in query_params.items())
-        return base_url + query_params_str
+        return self._build_url(base_url, {**query_params, "page": page})
+
+    def _build_url(self, base_url: str, query_params: dict) -> str:
+        """Build URL string from base URL and URL-encoded query parameters"""
+        return base_url + "?" + urlencode(query_params)
 
     async def verified_event(self, event_id: UUID, check_published: bool) -> Event:
         """
         Retrieve an event by ID and verify it exists,
         also optionally verify if it is published.
         Raises 404 if not found, 403 if not published.
+        Event is served from event_cache when possible, and stored in it
+        only if read from primary.
         Return verified Event object
         """
-        event = await events_crud.get_one(self.db, Event.id == event_id)
+        event = event_cache.get(event_id)
+        if event is not None:
+            event_cache_hits_total.inc()
+        else:
+            event_cache_misses_total.inc()
+            generation = event_cache.generation
+            event = await events_crud.get_one(self.db, Event.id == event_id)
+            if event and self.populate_caches:
+                event_cache.set(event_id, detached_event_copy(event), generation)
         if not event:
             raise EventNotFoundError(f"Event with ID {event_id} not found")
         if check_published and event.status != "published":
             raise EventNotPublishedError(f"Event with ID {event_id} not published")
         return event
 
+    def _build_cursor_url(self, base_url: str, query_params: dict, cursor: str) -> str:
+        """
+        Build complete URL string for cursor pagination mode: page number
+        is dropped from query parameters in favour of opaque cursor
+        """
+        if not base_url.endswith("/"):
+            base_url = base_url + "/"
+        params = {k: v for k, v in query_params.items() if k not in ("page", "cursor")}
+        params.update(pagination="cursor", cursor=cursor)
+        return self._build_url(base_url, params)
+
     async def get_events(
-        self, date_from: str, page: int, page_size: int, url: str, query_params: dict
+        self,
+        date_from: str,
+        page: int,
+        page_size: int,
+        url: str,
+        query_params: dict,
+        pagination: str = "page",
+        cursor: str | None = None,
+        count_mode: str = "exact",
+        date_to: str | None = None,
+        status: str | None = None,
+        city: str | None = None,
+        place_id: UUID | None = None,
+        name: str | None = None,
     ) -> PaginatedEventsResponse:
         """
-        Fetch events from database that match provided filters
+        Fetch events from database that match provided filters, either
+        page by page (OFFSET based) or by opaque cursor (keyset based).
+        Total count is exact or estimated by query planner, depending on
+        count_mode, and is cached for EVENTS_COUNT_CACHE_TTL_SECONDS,
+        unless counted on replica
         Return PaginatedEventsResponse
         """
         date_from = str_to_dt_utc(date_from)
+        if date_to is not None:
+            date_to = str_to_dt_utc(date_to)
+        filters = self._build_filters(date_from, date_to, status, city, place_id, name)
+        count_key = (count_mode, date_from, date_to, status, city, place_id, name)
+        if pagination == "cursor" or cursor:
+            return await self._get_events_by_cursor(
+                filters, count_key, page_size, cursor, url, query_params
+            )
         offset = (page - 1) * page_size
 
-        count, events = await events_crud.get_many_with_count(
-            self.db,
-            Event.event_time >= date_from,
-            order_by=Event.event_time,
-            offset=offset,
-            limit=page_size,
-        )
+        count = events_count_cache.get(count_key)
+        if count is None and count_mode == "exact":
+            generation = events_count_cache.generation
+            count, events = await events_crud.get_many_with_count(
+                self.db,
+                *filters,
+                order_by=Event.event_time,
+                offset=offset,
+                limit=page_size,
+            )
+            if self.populate_caches:
+                events_count_cache.set(count_key, count, generation)
+        else:
+            count = await self._count_events(count_key, *filters)
+            events = await events_crud.get_many(
+                self.db,
+                *filters,
+                order_by=Event.event_time,
+                offset=offset,
+                limit=page_size,
+            )
 
-        base_url_with_page = self._build_full_url(url, query_params)
         next_url = prev_url = None
 
-        if offset + page_size < count:
-            next_url = base_url_with_page.replace(f"page={page}", f"page={page + 1}")
+        if count_mode == "approximate":
+            # Estimate may fall short of actual number of rows
+            count = max(count, offset + len(events))
+            has_next = len(events) == page_size
+        else:
+            has_next = offset + page_size < count
+
+        if has_next:
+            next_url = self._build_page_url(url, query_params, page + 1)
 
         if page > 1:
-            prev_url = base_url_with_page.replace(f"page={page}", f"page={page - 1}")
+            prev_url = self._build_page_url(url, query_params, page - 1)
+
+        return PaginatedEventsResponse(
+            count=count,
+            next=next_url,
+            previous=prev_url,
+            results=[PaginatedEventResponse.model_validate(event) for event in events],
+        )
+
+    async def get_events_json(self, cache_key: Hashable, **kwargs) -> bytes:
+        """
+        Fetch events listing like get_events does, serialized to JSON.
+        Serialized responses are served from and stored in
+        events_response_cache under cache_key, which must identify all
+        parameters affecting response, including data version. Version is
+        read through the same session, so responses read from replica are
+        stored under the version they reflect
+        Return JSON bytes
+        """
+        content = events_response_cache.get(cache_key)
+        if content is not None:
+            events_response_cache_hits_total.inc()
+            return content
+        events_response_cache_misses_total.inc()
+        response = await self.get_events(**kwargs)
+        content = response.__pydantic_serializer__.to_json(response)
+        events_response_cache.set(cache_key, content)
+        return content
+
+    def _build_filters(
+        self,
+        date_from: datetime,
+        date_to: datetime | None,
+        status: str | None,
+        city: str | None,
+        place_id: UUID | None,
+        name: str | None,
+    ) -> tuple:
+        """
+        Build event filters from query parameters, skipping those not given.
+        date_to is inclusive: events of that whole day match.
+        Name is searched case-insensitively as a substring
+        Return tuple of SQL expressions
+        """
+        filters = [Event.event_time >= date_from]
+        if date_to is not None:
+            filters.append(Event.event_time < date_to + timedelta(days=1))
+        if status is not None:
+            filters.append(Event.status == status)
+        if place_id is not None:
+            filters.append(Event.place_id == place_id)
+        if city is not None:
+            filters.append(Event.place_id.in_(select(Place.id).filter_by(city=city)))
+        if name is not None:
+            escaped = re.sub(r"([\\%_])", r"\\\1", name)
+            filters.append(Event.name.ilike(f"%{escaped}%", escape="\\"))
+        return tuple(filters)
+
+    async def _count_events(self, count_key: tuple, *filters) -> int:
+        """
+        Count events that match provided filters: exactly, or from query
+        planner estimate if count mode in count_key is 'approximate'.
+        Result is served from events_count_cache, and stored in it only if
+        counted on primary
+        Return number of events
+        """
+        count = events_count_cache.get(count_key)
+        if count is None:
+            generation = events_count_cache.generation
+            count_mode = count_key[0]
+            if count_mode == "approximate":
+                count = await events_crud.estimate_count(self.db, *filters)
+            else:
+                count = await events_crud.count_filtered(self.db, *filters)
+            if self.populate_caches:
+                events_count_cache.set(count_key, count, generation)
+        return count
+
+    async def _get_events_by_cursor(
+        self,
+        filters: tuple,
+        count_key: tuple,
+        page_size: int,
+        cursor: str | None,
+        url: str,
+        query_params: dict,
+    ) -> PaginatedEventsResponse:
+        """
+        Fetch a page of events positioned by cursor, ordered by
+        (event_time, id). One extra row is fetched to find out whether
+        there are more rows in the direction of paging
+        Return PaginatedEventsResponse
+        """
+        after = before = None
+        if cursor:
+            try:
+                event_time, event_id, direction = decode_cursor(cursor)
+            except ValueError:
+                raise EventsBadCursorError(f"Invalid cursor: {cursor}")
+            if direction == "prev":
+                before = (event_time, event_id)
+            else:
+                after = (event_time, event_id)
+
+        count = await self._count_events(count_key, *filters)
+        events = await events_crud.get_many_keyset(
+            self.db, *filters, after=after, before=before, limit=page_size + 1
+        )
+        has_more = len(events) > page_size
+        if has_more:
+            events = events[1:] if before else events[:-1]
+
+        has_next = True if before else has_more
+        has_prev = has_more if before else after is not None
+        next_url = prev_url = None
+
+        if events and has_next:
+            next_cursor = encode_cursor(events[-1].event_time, events[-1].id, "next")
+            next_url = self._build_cursor_url(url, query_params, next_cursor)
+
+        if events and has_prev:
+            prev_cursor = encode_cursor(events[0].event_time, events[0].id, "prev")
+            prev_url = self._build_cursor_url(url, query_params, prev_cursor)
 
         return PaginatedEventsResponse(
             count=count,
@@ -91,6 +393,14 @@ class EventService:
             results=[PaginatedEventResponse.model_validate(event) for event in events],
         )
 
+    async def get_data_version(self) -> datetime | None:
+        """
+        Return timestamp of the latest commit of sync, be it a page along
+        with its checkpoint or sync's outcome: event data only changes
+        when sync commits, so it versions every event representation
+        """
+        return await sync_crud.get_data_version(self.db)
+
     async def get_single_event(self, event_id) -> SingleEventResponse:
         """Fetch single event from database based on event_id"""
         return await self.verified_event(event_id, False)
@@ -102,32 +412,161 @@ class EventService:
         Fetch available seats for an event:
         if no cache exists in database for this event - request valid list
         of seats from Events Provider API, otherwise use cache entry to
-        form response
+        form response.
+        With SEATS_CACHE_STALE_WHILE_REVALIDATE, entries past TTL, but within
+        hard expiry, are served immediately and refreshed in background
         Return EventSeatsResponse
         """
         event = await self.verified_event(event_id, True)
-        seats = None
-        if use_cache:
-            seats = await seats_cache_crud.get_one(
-                self.db,
-                EventSeatsCache.event_id == event.id,
-                EventSeatsCache.updated_at >= datetime.now(UTC) - timedelta(seconds=30),
+        if not use_cache:
+            seats = await self._fetch_seats(self.db, event.id, client)
+            return EventSeatsResponse(
+                event_id=seats.event_id, available_seats=seats.seats
+            )
+
+        if dev_settings.SEATS_REFRESH_TOP_N > 0:
+            seats_requests_counter[event.id] += 1
+        swr = dev_settings.SEATS_CACHE_STALE_WHILE_REVALIDATE
+        max_age = SEATS_CACHE_HARD_EXPIRY if swr else SEATS_CACHE_TTL
+        seats = await self._get_cached_seats(self.db, event.id, max_age)
+        cache_hits_total.inc() if seats else cache_misses_total.inc()
+        if seats:
+            age = datetime.now(UTC) - seats.updated_at
+            seats_cache_age_seconds.observe(age.total_seconds())
+            if age > SEATS_CACHE_TTL:
+                seats_cache_staleness_seconds.observe(
+                    (age - SEATS_CACHE_TTL).total_seconds()
+                )
+                self._revalidate_seats_in_background(event.id, client)
+        else:
+            seats, shared = await seats_single_flight.do(
+                event.id, lambda: self._coalesced_fetch_seats(event.id, client)
             )
-            cache_hits_total.inc() if seats else cache_misses_total.inc()
-        if not seats:
-            data_from_provider = await client.get_seats(event.id)
-            data_from_provider.update({
-                "event_id": event_id,
-                "updated_at": datetime.now(UTC),
-            })
-            seats = EventSeatsCacheUpdate.model_validate(data_from_provider)
-            await seats_cache_crud.upsert(self.db, seats)
-            await self.db.commit()
+            if shared:
+                seats_requests_coalesced_total.inc()
 
         return EventSeatsResponse(event_id=seats.event_id, available_seats=seats.seats)
 
-    async def get_events_count(self):
-        return await events_crud.count_rows(self.db)
+    def _revalidate_seats_in_background(
+        self, event_id: UUID, client: EventsProviderClient
+    ) -> None:
+        """
+        Schedule refresh of stale seats cache entry, unless one is already
+        in flight
+        """
+        if event_id in seats_single_flight:
+            return
+        task = asyncio.create_task(self._revalidate_seats(event_id, client))
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
+    async def _revalidate_seats(
+        self, event_id: UUID, client: EventsProviderClient
+    ) -> None:
+        """Refresh seats cache entry, logging instead of raising errors"""
+        try:
+            await self._refresh_seats(event_id, client)
+        except Exception as e:
+            log.warning(f"Seats refresh failed for event {event_id}: {e}")
+
+    async def _refresh_seats(
+        self, event_id: UUID, client: EventsProviderClient
+    ) -> EventSeatsCache | EventSeatsCacheUpdate:
+        """Refresh seats cache entry, joining refresh already in flight"""
+        seats, _ = await seats_single_flight.do(
+            event_id, lambda: self._coalesced_fetch_seats(event_id, client)
+        )
+        return seats
+
+    async def _get_cached_seats(
+        self, db: AsyncSession, event_id: UUID, max_age: timedelta = SEATS_CACHE_TTL
+    ) -> EventSeatsCache | None:
+        """
+        Fetch seats cache entry for an event, if it is not older than max_age
+        Return EventSeatsCache object or None
+        """
+        return await seats_cache_crud.get_one(
+            db,
+            EventSeatsCache.event_id == event_id,
+            EventSeatsCache.updated_at >= datetime.now(UTC) - max_age,
+        )
+
+    async def _fetch_seats(
+        self, db: AsyncSession, event_id: UUID, client: EventsProviderClient
+    ) -> EventSeatsCacheUpdate:
+        """
+        Request list of seats from Events Provider API and store it
+        in seats cache table
+        Return EventSeatsCacheUpdate
+        """
+        data_from_provider = await client.get_seats(event_id)
+        data_from_provider.update({
+            "event_id": event_id,
+            "updated_at": datetime.now(UTC),
+        })
+        seats = EventSeatsCacheUpdate.model_validate(data_from_provider)
+        await seats_cache_crud.upsert(db, seats)
+        await db.commit()
+        return seats
+
+    async def _coalesced_fetch_seats(
+        self, event_id: UUID, client: EventsProviderClient
+    ) -> EventSeatsCache | EventSeatsCacheUpdate:
+        """
+        Refresh seats cache entry on behalf of all concurrent requests for
+        the event, in a session of its own, since it may outlive the request
+        that started it. With SEATS_COALESCE_ACROSS_WORKERS, a transaction-
+        scoped advisory lock serializes refreshes across processes as well,
+        and whoever acquires it after a refresh reuses the fresh entry
+        Return EventSeatsCache or EventSeatsCacheUpdate
+        """
+        async with async_session_local() as db:
+            if dev_settings.SEATS_COALESCE_ACROSS_WORKERS:
+                lock_id = create_lock_key(f"event_seats:{event_id}")
+                await db.execute(
+                    text("SELECT pg_advisory_xact_lock(:lock_id)"),
+                    {"lock_id": lock_id},
+                )
+                seats = await self._get_cached_seats(db, event_id)
+                if seats:
+                    return seats
+            return await self._fetch_seats(db, event_id, client)
+
+
+async def refresh_popular_seats(client: EventsProviderClient) -> None:
+    """
+    Refresh seats cache entries for the SEATS_REFRESH_TOP_N most requested
+    upcoming published events since previous run, so that their seats are
+    served from cache without waiting for Events Provider API
+    Return None
+    """
+    top_requested = [
+        event_id
+        for event_id, _ in seats_requests_counter.most_common(
+            dev_settings.SEATS_REFRESH_TOP_N
+        )
+    ]
+    seats_requests_counter.clear()
+    if not top_requested:
+        return
+
+    async with async_session_local() as db:
+        upcoming = await events_crud.get_many(
+            db,
+            Event.id.in_(top_requested),
+            Event.status == "published",
+            Event.event_time > datetime.now(UTC),
+            limit=len(top_requested),
+        )
+        service = EventService(db)
+        results = await asyncio.gather(
+            *(service._refresh_seats(event.id, client) for event in upcoming),
+            return_exceptions=True,
+        )
+    failed = [result for result in results if isinstance(result, Exception)]
+    log.info(f"Seats refreshed for {len(results) - len(failed)} popular events")
+    for error in failed:
+        log.warning(f"Seats refresh failed: {error}")
 
 
 class EventNotFoundError(EntityNotFoundError):
@@ -140,3 +579,9 @@ class EventNotPublishedError(EntityBadDataError):
     """Raised when event is not published"""
 
     pass
+
+
+class EventsBadCursorError(EntityBadDataError):
+    """Raised when pagination cursor cannot be decoded"""
+
+    status_code = 400
@@ -0,0 +1,44 @@
+from prometheus_client import Gauge
+
+from src.crud.events import events_crud
+from src.crud.outbox import outbox_crud
+from src.crud.tickets import tickets_crud
+from src.database.database import get_ctx_read_db
+from src.models.outbox import Outbox, OutboxStatus
+from src.utils.log import get_logger
+
+log = get_logger(__name__)
+
+events_total = Gauge(
+    "events_total",
+    "Number of events, estimated by query planner",
+    multiprocess_mode="mostrecent",
+)
+tickets_total = Gauge(
+    "tickets_total",
+    "Number of tickets, estimated by query planner",
+    multiprocess_mode="mostrecent",
+)
+outbox_pending_total = Gauge(
+    "outbox_pending_total",
+    "Number of outbox entries pending delivery",
+    multiprocess_mode="mostrecent",
+)
+
+
+async def collect_business_metrics() -> None:
+    """
+    Refresh business gauges, so that /metrics scrapes only serialize
+    in-memory registry. Large tables are counted from query planner
+    estimates; pending outbox entries are counted exactly, since
+    partial index on them keeps the count cheap. Read from replica,
+    when one is configured
+    Return None
+    """
+    async with get_ctx_read_db() as db:
+        events_total.set(await events_crud.estimate_count(db))
+        tickets_total.set(await tickets_crud.estimate_count(db))
+        outbox_pending_total.set(
+            await outbox_crud.count_filtered(db, Outbox.status == OutboxStatus.PENDING)
+        )
+    log.debug("Business metrics refreshed")
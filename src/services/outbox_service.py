@@ -1,118 +1,273 @@
 import asyncio
 import random
+from contextlib import suppress
 from datetime import datetime, UTC, timedelta
 
+import asyncpg
 import httpx
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
 
 from src.config import dev_settings
 from src.database.database import async_session_local
-from src.crud.outbox import outbox_crud
-from src.external.capashino import CapashinoClient
+from src.crud.outbox import OUTBOX_NOTIFY_CHANNEL, outbox_crud
+from src.external.capashino import CAPASHINO_TIMEOUT_SECONDS, CapashinoClient
 from src.models.outbox import OutboxStatus, Outbox
-from src.schemas.outbox import OutboxUpdate
 from src.utils.log import get_logger
 
 log = get_logger(__name__)
 
 BASE_DELAY = 1
 MAX_RETRIES = dev_settings.OUTBOX_MAX_RETRIES
+CRITICAL_STATUS_CODES = (400, 401, 404, 409, 422)
+LISTENER_RECONNECT_DELAY = 5
+LISTENER_HEALTHCHECK_INTERVAL = 10
 
 
-async def outbox_process_events() -> None:
+def _next_attempt_at(retry_count: int) -> datetime:
     """
-    Fetch pending Outbox events from DB, attempt sending them to Capashino
-    Notifications API, if successful mark as sent in DB
-    Return None
+    Calculate time of next delivery attempt using exponential backoff
+    with jitter, based on number of failed attempts so far
+    Return timezone-aware datetime object
+    """
+    delay = BASE_DELAY * (2 ** (retry_count - 1)) + random.uniform(0, 1)
+    return datetime.now(UTC) + timedelta(seconds=delay)
+
+
+async def _dispatch_event(
+    client: CapashinoClient, event: Outbox, semaphore: asyncio.Semaphore
+) -> dict:
+    """
+    Make single attempt at sending Outbox event to Capashino Notifications
+    API. On failure, schedule next attempt instead of retrying in place.
+    Semaphore bounds number of concurrent requests
+    Return dict with resulting id, status, retry_count and next_attempt_at
+    of Outbox event
+    """
+    result = {
+        "id": event.id,
+        "status": OutboxStatus.PENDING,
+        "retry_count": event.retry_count,
+        "next_attempt_at": event.next_attempt_at,
+    }
+    try:
+        async with semaphore:
+            await client.send_notification(event.payload)
+        result["status"] = OutboxStatus.SENT
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        attempt = event.retry_count + 1
+        log.warning(
+            f"Attempt {attempt}/{MAX_RETRIES} failed for outbox {event.id}: {e}"
+        )
+        if (
+            isinstance(e, httpx.HTTPStatusError)
+            and e.response.status_code in CRITICAL_STATUS_CODES
+        ):
+            log.error("Encountered critical error, aborting retries")
+            result["retry_count"] = MAX_RETRIES
+        else:
+            result["retry_count"] = attempt
+            result["next_attempt_at"] = _next_attempt_at(attempt)
+            if attempt >= MAX_RETRIES:
+                log.error(f"All retries exhausted for outbox {event.id}")
+    return result
+
+
+async def outbox_process_events(client: CapashinoClient) -> int:
+    """
+    Claim a batch of pending Outbox events that are due for delivery
+    attempt: lock them and push their next_attempt_at
+    OUTBOX_CLAIM_TIMEOUT_SECONDS ahead in a short transaction, so that no
+    other run picks them up meanwhile. Then send them to Capashino
+    Notifications API concurrently (at most OUTBOX_DISPATCH_CONCURRENCY
+    requests at a time) over shared client, outside of any transaction,
+    and write results of the whole batch back in one statement.
+    Failed events are rescheduled via next_attempt_at, and events claimed
+    by a run that died mid-dispatch are due again once claim runs out
+    Return number of processed events
     """
     async with async_session_local() as db:
         pending = await outbox_crud.get_many_with_lock(
             db,
             Outbox.status == OutboxStatus.PENDING,
             Outbox.retry_count < dev_settings.OUTBOX_MAX_RETRIES,
-            order_by=Outbox.created_at,
-            limit=50,
+            Outbox.next_attempt_at <= datetime.now(UTC),
+            order_by=Outbox.next_attempt_at,
+            limit=dev_settings.OUTBOX_BATCH_SIZE,
+        )
+        if not pending:
+            return 0
+        claimed_until = datetime.now(UTC) + timedelta(
+            seconds=dev_settings.OUTBOX_CLAIM_TIMEOUT_SECONDS
         )
+        await outbox_crud.update_where(
+            db,
+            Outbox.id.in_([event.id for event in pending]),
+            update_data={
+                "next_attempt_at": claimed_until,
+                "updated_at": func.timezone("UTC", func.now()),
+            },
+        )
+        await db.commit()
 
-        for event in pending:
-            async with db.begin_nested():
-                for attempt in range(1, MAX_RETRIES + 1):
-                    try:
-                        async with CapashinoClient() as client:
-                            await client.send_notification(event.payload)
-                        await outbox_crud.update(
-                            db, event, OutboxUpdate(status=OutboxStatus.SENT)
-                        )
-                        break
-                    except (httpx.HTTPStatusError, httpx.RequestError) as e:
-                        log.warning(
-                            f"Attempt {attempt}/{MAX_RETRIES} failed for outbox {event.id}: {e}"
-                        )
-                        if isinstance(
-                            e, httpx.HTTPStatusError
-                        ) and e.response.status_code in (400, 401, 404, 409, 422):
-                            log.error("Encountered critical error, aborting retries")
-                            await outbox_crud.update(
-                                db, event, OutboxUpdate(retry_count=MAX_RETRIES)
-                            )
-                            break
-
-                        await outbox_crud.update(
-                            db,
-                            event,
-                            OutboxUpdate(retry_count=event.retry_count + 1),
-                        )
-                        if event.retry_count == MAX_RETRIES:
-                            log.error(f"All retries exhausted for outbox {event.id}")
-                            break
-                        else:
-                            delay = BASE_DELAY * (2 ** (attempt - 1)) + random.uniform(
-                                0, 1
-                            )
-                            await asyncio.sleep(delay)
+    semaphore = asyncio.Semaphore(dev_settings.OUTBOX_DISPATCH_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_dispatch_event(client, event, semaphore) for event in pending)
+    )
+    async with async_session_local() as db:
+        await outbox_crud.bulk_update(
+            db, results, updated_at=func.timezone("UTC", func.now())
+        )
         await db.commit()
+    sent = sum(result["status"] == OutboxStatus.SENT for result in results)
+    log.info(f"Outbox events sent: {sent}/{len(results)}")
+    return len(results)
+
+
+def check_outbox_claim_timeout() -> None:
+    """
+    Warn if claim of a batch may run out before the batch is dispatched,
+    which would let another run send the same events again: every round
+    of OUTBOX_DISPATCH_CONCURRENCY requests takes up to Capashino timeout
+    """
+    rounds = -(
+        -dev_settings.OUTBOX_BATCH_SIZE // dev_settings.OUTBOX_DISPATCH_CONCURRENCY
+    )
+    dispatch_time = rounds * CAPASHINO_TIMEOUT_SECONDS
+    if dispatch_time >= dev_settings.OUTBOX_CLAIM_TIMEOUT_SECONDS:
+        log.warning(
+            f"OUTBOX_CLAIM_TIMEOUT_SECONDS={dev_settings.OUTBOX_CLAIM_TIMEOUT_SECONDS} "
+            f"is shorter than batch may take to dispatch ({dispatch_time}s), "
+            "events may be sent more than once"
+        )
+
+
+class OutboxListener:
+    """
+    Wake outbox dispatcher up as soon as new events are committed, by
+    listening to Postgres NOTIFY on a dedicated asyncpg connection.
+    Interval polling stays in place as a fallback for notifications missed
+    while listener was reconnecting
+    """
+
+    def __init__(self, client: CapashinoClient) -> None:
+        self.client = client
+        self.dsn = dev_settings.POSTGRES_DB_URL.replace(
+            "postgresql+asyncpg://", "postgresql://"
+        )
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start listening in background task"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close connection"""
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Keep listener connection open, reconnecting on failures"""
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.dsn)
+                await conn.add_listener(OUTBOX_NOTIFY_CHANNEL, self._on_notify)
+                log.info(f"Listening to {OUTBOX_NOTIFY_CHANNEL} notifications")
+                # Catch up on events committed while listener was down
+                self._wakeup.set()
+                await self._dispatch_on_notify(conn)
+            except (OSError, asyncpg.PostgresError, SQLAlchemyError) as e:
+                log.warning(f"Outbox listener failed: {e}")
+            except Exception:
+                # Keep listening whatever goes wrong, polling alone is slow
+                log.exception("Outbox listener failed unexpectedly")
+            finally:
+                if conn is not None:
+                    with suppress(OSError, asyncpg.PostgresError, TimeoutError):
+                        await conn.close()
+            await asyncio.sleep(LISTENER_RECONNECT_DELAY)
+
+    async def _dispatch_on_notify(self, conn: asyncpg.Connection) -> None:
+        """
+        Run outbox dispatcher whenever notification arrives, until listener
+        connection is lost. Full batch means more events may be pending, so
+        dispatcher is run again without waiting
+        """
+        while not conn.is_closed():
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=LISTENER_HEALTHCHECK_INTERVAL
+                )
+            except TimeoutError:
+                continue
+            self._wakeup.clear()
+            processed = await outbox_process_events(self.client)
+            if processed >= dev_settings.OUTBOX_BATCH_SIZE:
+                self._wakeup.set()
 
 
 async def outbox_reset_failed_events() -> None:
     """
     Reset retry_count back to 0 for all Outbox events that reached max_retries
-    attempts, yet are still in pending status in DB
+    attempts, yet are still in pending status in DB.
+    Events are reset in chunks of OUTBOX_MAINTENANCE_CHUNK_SIZE, each in
+    its own short transaction
     Return None
     """
     log.info("Starting failed events reset job")
+    chunk_size = dev_settings.OUTBOX_MAINTENANCE_CHUNK_SIZE
+    total_reset = 0
     async with async_session_local() as db:
-        failed_events = await outbox_crud.get_many_with_lock(
-            db,
-            Outbox.status == OutboxStatus.PENDING,
-            Outbox.retry_count == MAX_RETRIES,
-            order_by=Outbox.created_at,
-            limit=(2**63 - 1),
-        )
-        log.info(f"Failed events found: {len(failed_events)}")
-
-        for event in failed_events:
-            await outbox_crud.update(db, event, OutboxUpdate(retry_count=0))
-        await db.commit()
+        while True:
+            reset = await outbox_crud.update_where(
+                db,
+                Outbox.status == OutboxStatus.PENDING,
+                Outbox.retry_count == MAX_RETRIES,
+                update_data={
+                    "retry_count": 0,
+                    "next_attempt_at": datetime.now(UTC),
+                    "updated_at": func.timezone("UTC", func.now()),
+                },
+                limit=chunk_size,
+            )
+            await db.commit()
+            total_reset += reset
+            if reset < chunk_size:
+                break
+    log.info(f"Failed events reset: {total_reset}")
 
 
 async def outbox_delete_old_events() -> None:
     """
     Delete all Outbox events that were successfully sent
-    and are older than OUTBOX_EVENTS_LIFESPAN_HOURS
+    and are older than OUTBOX_EVENTS_LIFESPAN_HOURS.
+    Events are deleted in chunks of OUTBOX_MAINTENANCE_CHUNK_SIZE, each in
+    its own short transaction
     Return None
     """
     log.info("Starting old events deletion job")
+    chunk_size = dev_settings.OUTBOX_MAINTENANCE_CHUNK_SIZE
+    cutoff = datetime.now(UTC) - timedelta(
+        hours=dev_settings.OUTBOX_EVENTS_LIFESPAN_HOURS
+    )
+    total_deleted = 0
     async with async_session_local() as db:
-        old_events = await outbox_crud.get_many_with_lock(
-            db,
-            Outbox.status == OutboxStatus.SENT,
-            Outbox.updated_at
-            < datetime.now(UTC)
-            - timedelta(hours=dev_settings.OUTBOX_EVENTS_LIFESPAN_HOURS),
-            order_by=Outbox.created_at,
-            limit=(2 * 63 - 1),
-        )
-        log.info(f"Old events found: {len(old_events)}")
-
-        for event in old_events:
-            await outbox_crud.delete(db, event)
-        await db.commit()
+        while True:
+            deleted = await outbox_crud.delete_where(
+                db,
+                Outbox.status == OutboxStatus.SENT,
+                Outbox.updated_at < cutoff,
+                limit=chunk_size,
+            )
+            await db.commit()
+            total_deleted += deleted
+            if deleted < chunk_size:
+                break
+    log.info(f"Old events deleted: {total_deleted}")
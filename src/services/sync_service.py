@@ -1,25 +1,38 @@
-from datetime import datetime
+import asyncio
+from contextlib import suppress
+from datetime import UTC, datetime, time, timedelta
 from typing import Any, AsyncGenerator
 
 import httpx
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import text
 from starlette.responses import JSONResponse
 
 from src.api.routes.exceptions import OperationFailedError
+from src.config import dev_settings
+from src.crud.base import UpsertResult
 from src.crud.events import events_crud
+from src.crud.places import places_crud
+from src.crud.sync_checkpoint import sync_checkpoint_crud
 from src.crud.sync_metadata import sync_crud
 from src.database.database import engine
 from src.external.events_provider import EventsProviderClient
+from src.models.sync_checkpoint import SyncCheckpoint
 from src.models.sync_metadata import SyncMetadata
-from src.schemas.event import EventCreate
+from src.schemas.event import EventCreate, EventRecord
+from src.schemas.sync_checkpoint import SyncCheckpointUpdate
 from src.schemas.sync_metadata import SyncMetadataCreate
+from src.services.cache_invalidation import notify_cache_invalidation
+from src.services.event_service import invalidate_event_caches
 from src.utils.create_lock_key import create_lock_key
 from src.utils.datetime_converter import str_to_dt_utc
 from src.utils.log import get_logger
 
 log = get_logger(__name__)
 
+SYNC_CHECKPOINT_NAME = "events_sync"
+
 
 class SyncService:
     """
@@ -57,55 +70,315 @@ class SyncService:
         updated_model = SyncMetadataCreate.model_validate(upd_dict)
         return await sync_crud.create(self.db, updated_model)
 
-    async def _save_events(self, events: list[dict[str, Any]]) -> list[dict]:
+    async def _save_events(
+        self, events: list[dict[str, Any]]
+    ) -> tuple[UpsertResult, UpsertResult]:
         """
-        Upsert records in event table
-        Return list of dicts containing pk_column:pk_value pairs,
-        representing updated rows (not full ORMModels, for brevity's sake).
+        Upsert places of events, deduplicated by ID, in place table, then
+        upsert events themselves in event table, referencing places by ID.
+        Unchanged records are left untouched
+        Return tuple of UpsertResult for events and UpsertResult for places
         """
         event_creates = [EventCreate.model_validate(event) for event in events]
         log.debug(f"Parsed {len(events)} events")
-        return await events_crud.bulk_upsert(self.db, event_creates)
+        places = {}
+        for event in event_creates:
+            place = places.get(event.place.id)
+            if place is None or event.place.changed_at > place.changed_at:
+                places[event.place.id] = event.place
+        saved_places = await places_crud.bulk_upsert(self.db, list(places.values()))
 
-    async def sync(self, sync_type: str) -> JSONResponse:
+        records = [
+            EventRecord(**event.model_dump(exclude={"place"}), place_id=event.place.id)
+            for event in event_creates
+        ]
+        if dev_settings.SYNC_BULK_LOADER == "copy":
+            saved_events = await events_crud.bulk_load(self.db, records)
+        else:
+            saved_events = await events_crud.bulk_upsert(self.db, records)
+        return saved_events, saved_places
+
+    async def _save_page(
+        self,
+        events: list[dict[str, Any]],
+        page_max: datetime,
+        next_url: str | None,
+        progress: SyncProgress,
+    ) -> None:
         """
-        Sync all events created or updated in Events Provider since last sync
-        Return JSONResponse
+        Upsert one page of events, account for it in sync progress and
+        commit it along with checkpoint, so that failed sync can be resumed
+        from the next page
         """
-        log.info(f"Running sync of type: {sync_type}")
-        last_changed_at = await self._get_last_changed_at()
-        log.info(f"Currently saved last_changed_at: {last_changed_at}")
-        paginator = EventsPaginator(self.client, last_changed_at)
-        current_max = last_changed_at
-        total_saved = 0
+        saved, saved_places = await self._save_events(events)
+        progress.synced_ids.extend(pk["id"] for pk in saved.changed)
+        progress.synced_place_ids.extend(pk["id"] for pk in saved_places.changed)
+        progress.total_saved += len(events)
+        progress.inserted += len(saved.inserted)
+        progress.updated += len(saved.updated)
+        progress.unchanged += saved.unchanged
+        progress.pages_synced += 1
+        progress.current_max = max(progress.current_max, page_max)
+        await self._save_checkpoint(next_url, progress)
+        await self.db.commit()
 
+    async def _save_checkpoint(
+        self, next_url: str | None, progress: SyncProgress
+    ) -> SyncCheckpoint:
+        """
+        Upsert record in sync_checkpoint table
+        Return SyncCheckpoint ORMModel object
+        """
+        checkpoint = SyncCheckpointUpdate(
+            name=SYNC_CHECKPOINT_NAME,
+            start_changed_at=progress.start_changed_at,
+            next_url=next_url,
+            page_max=progress.current_max,
+            pages_synced=progress.pages_synced,
+            events_synced=progress.total_saved,
+            events_inserted=progress.inserted,
+            events_updated=progress.updated,
+            events_unchanged=progress.unchanged,
+            updated_at=datetime.now(UTC),
+        )
+        return await sync_checkpoint_crud.upsert(self.db, checkpoint)
+
+    async def _start_from_checkpoint(
+        self, last_changed_at: datetime
+    ) -> tuple[EventsPaginator, SyncProgress]:
+        """
+        Set up paginator and progress of the sync: resume from cursor saved
+        by previous failed sync if there is one, start from last_changed_at
+        otherwise
+        Return tuple of EventsPaginator and SyncProgress
+        """
+        checkpoint = await sync_checkpoint_crud.get_one(
+            self.db, name=SYNC_CHECKPOINT_NAME
+        )
+        if checkpoint is None:
+            return (
+                EventsPaginator(self.client, last_changed_at),
+                SyncProgress(last_changed_at),
+            )
+
+        progress = SyncProgress(
+            checkpoint.start_changed_at,
+            current_max=checkpoint.page_max,
+            total_saved=checkpoint.events_synced,
+            pages_synced=checkpoint.pages_synced,
+            inserted=checkpoint.events_inserted,
+            updated=checkpoint.events_updated,
+            unchanged=checkpoint.events_unchanged,
+        )
+        if not checkpoint.next_url:
+            return EventsPaginator(self.client, progress.current_max), progress
+        log.info(f"Resuming sync after page {checkpoint.pages_synced}")
+        paginator = EventsPaginator(
+            self.client, checkpoint.start_changed_at, next_url=checkpoint.next_url
+        )
+        return paginator, progress
+
+    async def _run(self, paginator: EventsPaginator, progress: SyncProgress) -> None:
+        """
+        Run sync in configured mode. If cursor saved by previous sync is
+        rejected by Events Provider, fall back to walking pages from the last
+        saved page's changed_at
+        """
+        if dev_settings.SYNC_MODE == "parallel":
+            return await self._run_parallel(progress)
+        run = (
+            self._run_pipelined
+            if dev_settings.SYNC_MODE == "pipelined"
+            else self._run_sequential
+        )
         try:
-            async for events in paginator:
-                await self._save_events(events)
-                total_saved += len(events)
-                current_max = max(current_max, paginator.page_max)
+            await run(paginator, progress)
         except httpx.HTTPStatusError as e:
+            if (
+                not paginator.resumed
+                or paginator.pages_fetched
+                or not e.response.is_client_error
+            ):
+                raise
+            log.warning("Saved sync cursor rejected, restarting from last saved page")
+            await run(EventsPaginator(self.client, progress.current_max), progress)
+
+    async def _run_sequential(
+        self, paginator: EventsPaginator, progress: SyncProgress
+    ) -> None:
+        """Fetch and save pages one after another"""
+        async for events in paginator:
+            await self._save_page(
+                events, paginator.page_max, paginator.next_url, progress
+            )
+
+    async def _produce_pages(
+        self, paginator: EventsPaginator, queue: asyncio.Queue
+    ) -> None:
+        """
+        Fetch pages into queue, followed by None once pages run out.
+        Error while fetching is put into queue in place of the next page
+        """
+        try:
+            async for events in paginator:
+                await queue.put((events, paginator.page_max, paginator.next_url))
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(None)
+
+    async def _run_pipelined(
+        self, paginator: EventsPaginator, progress: SyncProgress
+    ) -> None:
+        """
+        Fetch pages in background task while saving previously fetched ones,
+        so that network and database latencies overlap. Queue of
+        SYNC_PIPELINE_DEPTH pages applies backpressure to fetching when
+        saving falls behind. Fetching error is raised once pages fetched
+        before it are saved
+        """
+        queue = asyncio.Queue(maxsize=dev_settings.SYNC_PIPELINE_DEPTH)
+        producer = asyncio.create_task(self._produce_pages(paginator, queue))
+        try:
+            while (page := await queue.get()) is not None:
+                if isinstance(page, Exception):
+                    raise page
+                await self._save_page(*page, progress)
+        finally:
+            producer.cancel()
+            with suppress(asyncio.CancelledError):
+                await producer
+
+    async def _run_parallel(self, progress: SyncProgress) -> None:
+        """
+        Split changed_at range since last saved page into date windows and
+        walk them with concurrent paginator chains, at most
+        SYNC_PARALLEL_CONCURRENCY at a time. Pages are saved one at a time,
+        along with watermark covering only windows synced without gaps, so
+        that failed sync is resumed without losing events. Once some chain
+        fails, the rest stop after their current page and error is raised
+        """
+        windows = split_sync_windows(
+            progress.current_max,
+            datetime.now(UTC),
+            dev_settings.SYNC_PARALLEL_WINDOWS,
+        )
+        log.info(f"Syncing {len(windows)} date windows in parallel")
+        semaphore = asyncio.Semaphore(dev_settings.SYNC_PARALLEL_CONCURRENCY)
+        save_lock = asyncio.Lock()
+        failed = asyncio.Event()
+
+        async def walk(window: SyncWindow) -> None:
+            async with semaphore:
+                paginator = EventsPaginator(self.client, window.start)
+                async for events in paginator:
+                    if failed.is_set():
+                        return
+                    in_window = window.select(events)
+                    if in_window:
+                        async with save_lock:
+                            window.page_max = max(
+                                datetime.fromisoformat(e["changed_at"])
+                                for e in in_window
+                            )
+                            await self._save_page(
+                                in_window, merge_watermark(windows), None, progress
+                            )
+                    if len(in_window) < len(events):
+                        break
+                window.done = True
+
+        async def guarded_walk(window: SyncWindow) -> None:
+            try:
+                await walk(window)
+            except Exception:
+                failed.set()
+                raise
+
+        results = await asyncio.gather(
+            *(guarded_walk(window) for window in windows), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        progress.current_max = max(progress.current_max, merge_watermark(windows))
+
+    def _invalidate_caches(self, event_ids: list, place_ids: list) -> None:
+        """
+        Drop cached data made stale by committed sync in this process.
+        Other processes drop it on notification sent along with commit
+        """
+        invalidate_event_caches(event_ids, place_ids)
+
+    async def _record_failure(
+        self, error: Exception, progress: SyncProgress, sync_type: str
+    ) -> None:
+        """
+        Record failed sync in sync_metadata, so that data version moves past
+        pages committed before the failure, and drop cached data made stale
+        by them. Failed transaction is rolled back first; caches are dropped
+        even if failure cannot be recorded
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            message = error.response.text
+        else:
+            message = repr(error)
+        try:
+            await self.db.rollback()
             await self._update_sync_metadata(
                 status="failed",
-                message=e.response.text,
-                last_changed_at=current_max,
+                message=message,
+                last_changed_at=progress.current_max,
                 sync_type=sync_type,
             )
+            await notify_cache_invalidation(
+                self.db, progress.synced_ids, progress.synced_place_ids
+            )
             await self.db.commit()
-            raise EventsSyncFailedError("Events sync failed")
+        except (OSError, SQLAlchemyError) as e:
+            log.error(f"Failed to record failed sync: {e}")
+        finally:
+            self._invalidate_caches(progress.synced_ids, progress.synced_place_ids)
+
+    async def sync(self, sync_type: str) -> JSONResponse:
+        """
+        Sync all events created or updated in Events Provider since last sync
+        Return JSONResponse
+        """
+        log.info(f"Running sync of type: {sync_type}")
+        last_changed_at = await self._get_last_changed_at()
+        log.info(f"Currently saved last_changed_at: {last_changed_at}")
+        paginator, progress = await self._start_from_checkpoint(last_changed_at)
+
+        try:
+            await self._run(paginator, progress)
+        except Exception as e:
+            await self._record_failure(e, progress, sync_type)
+            if isinstance(e, httpx.HTTPError):
+                raise EventsSyncFailedError("Events sync failed") from e
+            raise
         else:
             await self._update_sync_metadata(
                 status="success",
-                message=f"Events synced: {total_saved}",
-                last_changed_at=current_max,
+                message=(
+                    f"Events synced: {progress.total_saved} "
+                    f"(inserted: {progress.inserted}, updated: {progress.updated}, "
+                    f"unchanged: {progress.unchanged})"
+                ),
+                last_changed_at=progress.current_max,
                 sync_type=sync_type,
             )
-            if current_max > last_changed_at:
-                log.info(f"last_changed_at updated to {current_max}")
+            await sync_checkpoint_crud.delete_where(self.db, name=SYNC_CHECKPOINT_NAME)
+            if progress.current_max > last_changed_at:
+                log.info(f"last_changed_at updated to {progress.current_max}")
             else:
                 log.info("No new events since last sync")
-            log.info(f"Sync complete, events parsed: {total_saved}")
+            log.info(f"Sync complete, events parsed: {progress.total_saved}")
+            await notify_cache_invalidation(
+                self.db, progress.synced_ids, progress.synced_place_ids
+            )
             await self.db.commit()
+            self._invalidate_caches(progress.synced_ids, progress.synced_place_ids)
             return JSONResponse(status_code=200, content={"status": "success"})
 
     async def do_sync_with_lock(self, sync_type: str = "scheduled") -> JSONResponse:
@@ -117,6 +390,9 @@ class SyncService:
         lock_key = create_lock_key("events_sync")
 
         async with engine.connect() as lock_conn:
+            # Session-level lock is held for the whole sync: autocommit keeps
+            # the connection from sitting idle in transaction meanwhile
+            lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
             result = await lock_conn.execute(
                 text("SELECT pg_try_advisory_lock(:key)"), {"key": lock_key}
             )
@@ -134,6 +410,93 @@ class SyncService:
                 )
 
 
+class SyncProgress:
+    """Running totals of a single sync, saved as checkpoint after every page"""
+
+    def __init__(
+        self,
+        start_changed_at: datetime,
+        current_max: datetime | None = None,
+        total_saved: int = 0,
+        pages_synced: int = 0,
+        inserted: int = 0,
+        updated: int = 0,
+        unchanged: int = 0,
+    ) -> None:
+        self.start_changed_at = start_changed_at
+        self.current_max = current_max or start_changed_at
+        self.total_saved = total_saved
+        self.pages_synced = pages_synced
+        self.inserted = inserted
+        self.updated = updated
+        self.unchanged = unchanged
+        self.synced_ids = []
+        self.synced_place_ids = []
+
+
+class SyncWindow:
+    """
+    Range of changed_at walked by a single paginator chain in parallel sync.
+    Window with no end takes everything from its start onwards
+    """
+
+    def __init__(self, start: datetime, end: datetime | None = None) -> None:
+        self.start = start
+        self.end = end
+        self.page_max: datetime | None = None
+        self.done = False
+
+    def select(self, events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Return events belonging to this window. Provider returns events
+        ordered by changed_at, so once some event falls beyond window end,
+        the chain has walked the whole window
+        """
+        if self.end is None:
+            return events
+        return [e for e in events if datetime.fromisoformat(e["changed_at"]) < self.end]
+
+
+def split_sync_windows(
+    start: datetime, end: datetime, windows: int
+) -> list[SyncWindow]:
+    """
+    Split changed_at range between start and end into at most 'windows'
+    windows of whole days: Events Provider filters by changed_at date,
+    so windows start at midnight UTC, apart from the first one.
+    Last window is open-ended, to catch events changed during sync
+    Return list of SyncWindow objects, ordered by start
+    """
+    first_day = start.astimezone(UTC).date()
+    days = (end.astimezone(UTC).date() - first_day).days
+    step = max(1, -(-days // max(1, windows)))
+    boundaries = [
+        datetime.combine(first_day + timedelta(days=day), time(), tzinfo=UTC)
+        for day in range(step, days + 1, step)
+    ]
+    starts = [start, *boundaries]
+    return [
+        SyncWindow(window_start, window_end)
+        for window_start, window_end in zip(starts, [*boundaries, None])
+    ]
+
+
+def merge_watermark(windows: list[SyncWindow]) -> datetime:
+    """
+    Merge progress of parallel sync windows into a single changed_at
+    watermark: it may only advance through windows walked completely,
+    up to the last saved page of the first unfinished one
+    Return timezone-aware datetime object
+    """
+    watermark = windows[0].start
+    for window in windows:
+        if window.page_max is not None:
+            watermark = max(watermark, window.page_max)
+        if not window.done:
+            break
+    return watermark
+
+
 class EventsPaginator:
     """Iterator for fetching events from Events Provider API"""
 
@@ -141,11 +504,14 @@ class EventsPaginator:
         self,
         client: EventsProviderClient,
         last_changed_at: datetime | None = None,
+        next_url: str | None = None,
     ) -> None:
         self.client = client
         self.last_changed_at = last_changed_at
-        self.next_url: str | None = None
+        self.next_url = next_url
+        self.resumed = next_url is not None
         self.page_max: datetime | None = None
+        self.pages_fetched = 0
         self._has_more: bool = True
 
     def __aiter__(self):
@@ -161,6 +527,7 @@ class EventsPaginator:
         if not events:
             raise StopAsyncIteration
 
+        self.pages_fetched += 1
         self.page_max = max(datetime.fromisoformat(e["changed_at"]) for e in events)
         self.next_url = data.get("next", "")
         if not self.next_url:
@@ -169,12 +536,14 @@ class EventsPaginator:
         return events
 
 
-async def do_sync(sync_type: str, db: AsyncGenerator[AsyncSession]) -> JSONResponse:
+async def do_sync(
+    sync_type: str, db: AsyncGenerator[AsyncSession], client: EventsProviderClient
+) -> JSONResponse:
     """
     Sync function for APScheduler job manager
     Return simple JSON on successful run
     """
-    async with db() as session, EventsProviderClient() as client:
+    async with db() as session:
         service = SyncService(session, client)
         return await service.do_sync_with_lock(sync_type)
 
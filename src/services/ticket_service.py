@@ -123,7 +123,7 @@ class TicketService:
         )
         if datetime.now(UTC) >= event.registration_deadline:
             raise TicketBadDataError("Cannot register past registration deadline")
-        if not self._validate_seat(ticket_data["seat"], event.place["seats_pattern"]):
+        if not self._validate_seat(ticket_data["seat"], event.place.seats_pattern):
             raise TicketBadDataError(f"Invalid seat: {ticket_data['seat']}")
         seats = await self.events.get_seats(
             ticket_data["event_id"], self.client, use_cache=False
@@ -152,6 +152,7 @@ class TicketService:
             event_type="ticket_purchased", payload=outbox_payload
         )
         await outbox_crud.create(self.db, outbox_entry)
+        await outbox_crud.notify_pending(self.db)
         await self.db.commit()
         tickets_created_total.inc()
         return ticket
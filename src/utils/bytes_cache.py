@@ -0,0 +1,44 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+class BytesLRUCache:
+    """
+    In-process cache of byte strings bounded by their total size: least
+    recently used entries are evicted once 'max_bytes' is exceeded.
+    Values larger than max_bytes are not stored.
+    Setting max_bytes to 0 disables caching
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data: OrderedDict[Hashable, bytes] = OrderedDict()
+
+    def get(self, key: Hashable) -> bytes | None:
+        """Return cached value for key, or None if missing"""
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: bytes) -> None:
+        """Store value under key, evicting least recently used entries"""
+        if len(value) > self.max_bytes:
+            return
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self._data[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, evicted = self._data.popitem(last=False)
+            self.size -= len(evicted)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._data.clear()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
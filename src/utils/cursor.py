@@ -0,0 +1,38 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+CURSOR_DIRECTIONS = ("next", "prev")
+
+
+def encode_cursor(event_time: datetime, event_id: UUID, direction: str) -> str:
+    """
+    Encode keyset position (event_time, id) and paging direction into
+    an opaque URL-safe string
+    """
+    raw = json.dumps({
+        "t": event_time.isoformat(),
+        "id": str(event_id),
+        "d": direction,
+    })
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID, str]:
+    """
+    Decode cursor string created by encode_cursor.
+    Return tuple of event_time, id and paging direction.
+    Raise ValueError if cursor is malformed
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        event_time = datetime.fromisoformat(data["t"])
+        event_id = UUID(data["id"])
+        direction = data["d"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Malformed cursor: {cursor}") from e
+    if direction not in CURSOR_DIRECTIONS:
+        raise ValueError(f"Malformed cursor direction: {direction}")
+    return event_time, event_id, direction
@@ -0,0 +1,56 @@
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+def make_etag(version: datetime) -> str:
+    """Build weak entity tag from data version timestamp"""
+    return f'W/"{int(version.timestamp() * 1_000_000):x}"'
+
+
+def is_not_modified(headers: Headers, etag: str, last_modified: datetime) -> bool:
+    """
+    Evaluate conditional request headers against validators of current
+    representation. If-Modified-Since is only considered in absence of
+    If-None-Match, and is compared with second precision of HTTP dates
+    Return True if client's copy is still fresh
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except ValueError:
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_response(
+    request: Request, response: Response, version: datetime | None, max_age: int
+) -> Response | None:
+    """
+    Apply ETag, Last-Modified and Cache-Control headers derived from data
+    version to response. If request's validators match them, return
+    empty 304 Not Modified response to be sent instead, None otherwise
+    """
+    if version is None:
+        return None
+    headers = {
+        "ETag": make_etag(version),
+        "Last-Modified": format_datetime(version.astimezone(UTC), usegmt=True),
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+    if is_not_modified(request.headers, headers["ETag"], version):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,46 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls sharing the same key: while a call for a key
+    is in flight, other callers with that key await its result instead of
+    starting their own. The call runs in a separate task, so cancellation
+    of any single caller does not affect the others
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Remove finished task from in-flight calls"""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark exception as retrieved in case every caller went away
+            task.exception()
+
+    async def do(
+        self, key: Hashable, func: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """
+        Run func() unless a call with the same key is already in flight,
+        and await its result.
+        Return tuple of result and flag showing if result was shared
+        with a call started by another caller
+        """
+        task = self._in_flight.get(key)
+        shared = task is not None
+        if not shared:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task), shared
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
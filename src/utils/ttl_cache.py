@@ -0,0 +1,66 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+
+class TTLCache:
+    """
+    Bounded in-process cache: entries expire after 'ttl' seconds, and least
+    recently used entries are evicted once 'maxsize' is exceeded.
+    Setting ttl or maxsize to 0 disables caching.
+    Every invalidation bumps 'generation': value loaded before it may be
+    stale, so set skips values loaded at a different generation
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value for key, or default if missing or expired"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        """
+        Store value under key, evicting least recently used entries.
+        If generation the value was loaded at is given, value is only stored
+        if cache has not been invalidated since
+        """
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        """Drop entries for given keys, if present"""
+        self.generation += 1
+        for key in keys:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> None:
+        """Drop entries whose values satisfy predicate"""
+        stale = [key for key, (_, value) in self._data.items() if predicate(value)]
+        self.invalidate(stale)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self.generation += 1
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,30 @@
+from src.utils.bytes_cache import BytesLRUCache
+
+
+def test_bytes_cache_evicts_by_total_size():
+    """Least recently used entries are evicted until total size fits"""
+    cache = BytesLRUCache(max_bytes=10)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    cache.get("a")
+    cache.set("c", b"cccc")
+
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"cccc"
+    assert cache.size == 8
+
+
+def test_bytes_cache_replace_oversized_and_clear():
+    """Replacing entry frees its old size, oversized values aren't stored"""
+    cache = BytesLRUCache(max_bytes=10)
+    cache.set("a", b"aaaa")
+    cache.set("a", b"aa")
+    cache.set("big", b"x" * 11)
+
+    assert cache.size == 2
+    assert cache.get("big") is None
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
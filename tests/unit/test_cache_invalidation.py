@@ -0,0 +1,112 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from src.services import cache_invalidation
+from src.services.cache_invalidation import (
+    CacheInvalidationListener,
+    decode_invalidation,
+    encode_invalidation,
+    notify_cache_invalidation,
+)
+from src.utils.ttl_cache import TTLCache
+
+
+class FakeNotifyServer:
+    """Stand-in for Postgres delivering committed NOTIFY to every listener"""
+
+    def __init__(self):
+        self.listeners = []
+        self.pending = []
+
+    async def connect(self, dsn):
+        server = self
+
+        class Connection:
+            async def add_listener(self, channel, callback):
+                server.listeners.append((self, channel, callback))
+
+            async def execute(self, query):
+                pass
+
+            async def close(self):
+                pass
+
+        return Connection()
+
+    async def execute(self, stmt, params):
+        """Session side: NOTIFY is queued until commit"""
+        self.pending.append((params["channel"], params["payload"]))
+
+    async def commit(self):
+        for channel, payload in self.pending:
+            for conn, listened, callback in self.listeners:
+                if listened == channel:
+                    callback(conn, 1, channel, payload)
+        self.pending.clear()
+
+
+class Worker:
+    """Process with its own event cache, kept in sync by listener"""
+
+    def __init__(self):
+        self.cache = TTLCache(maxsize=10, ttl=300)
+        self.listener = CacheInvalidationListener(self.invalidate)
+
+    def invalidate(self, event_ids, place_ids):
+        if event_ids is None:
+            self.cache.clear()
+            return
+        self.cache.invalidate(event_ids)
+        self.cache.invalidate_where(lambda event: event.place_id in place_ids)
+
+
+async def test_sync_in_one_worker_invalidates_caches_of_all_workers():
+    """Committed notification reaches listener of every worker"""
+    server = FakeNotifyServer()
+    changed, at_changed_place, untouched = uuid4(), uuid4(), uuid4()
+    place_id = uuid4()
+    workers = [Worker(), Worker()]
+
+    with patch.object(cache_invalidation.asyncpg, "connect", server.connect):
+        for worker in workers:
+            worker.listener.start()
+        await asyncio.sleep(0.01)
+        for worker in workers:
+            worker.cache.set(changed, SimpleNamespace(place_id=uuid4()))
+            worker.cache.set(at_changed_place, SimpleNamespace(place_id=place_id))
+            worker.cache.set(untouched, SimpleNamespace(place_id=uuid4()))
+
+        await notify_cache_invalidation(server, [changed], [place_id])
+        assert all(worker.cache.get(changed) for worker in workers)
+        await server.commit()
+
+        for worker in workers:
+            await worker.listener.stop()
+
+    for worker in workers:
+        assert worker.cache.get(changed) is None
+        assert worker.cache.get(at_changed_place) is None
+        assert worker.cache.get(untouched) is not None
+
+
+async def test_listener_drops_all_events_on_connect():
+    """Notifications missed while disconnected are made up for on connect"""
+    server = FakeNotifyServer()
+    on_invalidate = MagicMock()
+    listener = CacheInvalidationListener(on_invalidate)
+
+    with patch.object(cache_invalidation.asyncpg, "connect", server.connect):
+        listener.start()
+        await asyncio.sleep(0.01)
+        await listener.stop()
+
+    on_invalidate.assert_called_once_with(None, [])
+
+
+def test_oversized_payload_drops_all_events():
+    """Payload that does not fit into NOTIFY is replaced by drop-all one"""
+    event_ids = [uuid4() for _ in range(1000)]
+
+    assert decode_invalidation(encode_invalidation(event_ids, [])) == (None, [])
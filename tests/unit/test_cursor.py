@@ -0,0 +1,29 @@
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+
+from src.utils.cursor import decode_cursor, encode_cursor
+
+
+def test_cursor_roundtrip():
+    """Decoded cursor matches position and direction it was encoded from"""
+    event_time = datetime(2026, 5, 1, 18, 30, tzinfo=UTC)
+    event_id = uuid4()
+    cursor = encode_cursor(event_time, event_id, "prev")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (event_time, event_id, "prev")
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "", "eyJ0IjogMX0"])
+def test_cursor_malformed(cursor):
+    """Malformed cursor raises ValueError"""
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_cursor_bad_direction():
+    """Cursor with unknown paging direction is rejected"""
+    cursor = encode_cursor(datetime.now(UTC), uuid4(), "sideways")
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,169 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from src.config import dev_settings
+from src.crud.events import events_crud
+from src.models.event import Event
+from src.models.place import Place
+from src.models.seats_cache import EventSeatsCache
+from src.services import event_service
+from src.services.event_service import (
+    SEATS_CACHE_HARD_EXPIRY,
+    SEATS_CACHE_TTL,
+    EventService,
+    background_tasks,
+    event_cache,
+    invalidate_event_caches,
+    refresh_popular_seats,
+    seats_requests_counter,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_event_cache():
+    event_cache.clear()
+    yield
+    event_cache.clear()
+
+
+def make_event():
+    event = Event(id=uuid4(), place_id=uuid4(), status="published")
+    event.place = Place(id=event.place_id)
+    return event
+
+
+async def test_event_read_before_invalidation_is_not_cached():
+    """Row loaded while sync invalidates caches is served, but not cached"""
+    event = make_event()
+
+    async def get_one(db, *args):
+        invalidate_event_caches([event.id])
+        return event
+
+    with patch.object(events_crud, "get_one", AsyncMock(side_effect=get_one)):
+        service = EventService(MagicMock(info={"replica": False}))
+        assert await service.verified_event(event.id, True) is event
+
+    assert event_cache.get(event.id) is None
+
+
+async def test_replica_reads_do_not_populate_shared_cache():
+    """Events read from replica are served, but cached only from primary"""
+    event = make_event()
+
+    with patch.object(events_crud, "get_one", AsyncMock(return_value=event)):
+        replica = EventService(MagicMock(info={"replica": True}))
+        assert await replica.verified_event(event.id, True) is event
+        assert event_cache.get(event.id) is None
+
+        primary = EventService(MagicMock(info={"replica": False}))
+        await primary.verified_event(event.id, True)
+        assert event_cache.get(event.id) is not None
+
+
+def make_seats(event_id, age):
+    return EventSeatsCache(
+        event_id=event_id, seats=["A1", "A2"], updated_at=datetime.now(UTC) - age
+    )
+
+
+@pytest.fixture
+def seats_service():
+    """EventService with stale-while-revalidate on and published event"""
+    event = make_event()
+    service = EventService(MagicMock(info={"replica": False}))
+    service.verified_event = AsyncMock(return_value=event)
+    with patch.object(dev_settings, "SEATS_CACHE_STALE_WHILE_REVALIDATE", True):
+        yield service, event
+    seats_requests_counter.clear()
+
+
+async def test_fresh_seats_are_served_from_cache(seats_service):
+    """Entry within TTL is served without calling provider"""
+    service, event = seats_service
+    service._get_cached_seats = AsyncMock(
+        return_value=make_seats(event.id, timedelta(seconds=1))
+    )
+    service._coalesced_fetch_seats = AsyncMock()
+
+    seats = await service.get_seats(event.id, MagicMock())
+
+    assert seats.available_seats == ["A1", "A2"]
+    service._coalesced_fetch_seats.assert_not_awaited()
+
+
+async def test_stale_seats_are_served_while_one_refresh_runs(seats_service):
+    """Stale entries are served at once, with a single background refresh"""
+    service, event = seats_service
+    stale = make_seats(event.id, SEATS_CACHE_TTL + timedelta(seconds=1))
+    service._get_cached_seats = AsyncMock(return_value=stale)
+    refresh_started = asyncio.Event()
+    release_refresh = asyncio.Event()
+
+    async def refresh(event_id, client):
+        refresh_started.set()
+        await release_refresh.wait()
+        return make_seats(event_id, timedelta())
+
+    service._coalesced_fetch_seats = AsyncMock(side_effect=refresh)
+
+    first = await service.get_seats(event.id, MagicMock())
+    await refresh_started.wait()
+    second = await service.get_seats(event.id, MagicMock())
+    release_refresh.set()
+    await asyncio.gather(*background_tasks)
+
+    assert first.available_seats == second.available_seats == ["A1", "A2"]
+    service._coalesced_fetch_seats.assert_awaited_once()
+    assert service._get_cached_seats.await_args.args[2] == SEATS_CACHE_HARD_EXPIRY
+
+
+async def test_seats_past_hard_expiry_are_refreshed_in_place(seats_service):
+    """Entry past hard expiry is not served: request waits for provider"""
+    service, event = seats_service
+    service._get_cached_seats = AsyncMock(return_value=None)
+    fresh = make_seats(event.id, timedelta())
+    fresh.seats = ["B1"]
+    service._coalesced_fetch_seats = AsyncMock(return_value=fresh)
+
+    seats = await service.get_seats(event.id, MagicMock())
+
+    assert seats.available_seats == ["B1"]
+    service._coalesced_fetch_seats.assert_awaited_once()
+    assert not background_tasks
+
+
+@asynccontextmanager
+async def fake_session():
+    yield MagicMock(info={"replica": False})
+
+
+async def test_refresh_popular_seats_refreshes_top_requested():
+    """Only SEATS_REFRESH_TOP_N most requested events are refreshed"""
+    popular, runner_up, rare = uuid4(), uuid4(), uuid4()
+    seats_requests_counter.update({popular: 5, runner_up: 3, rare: 1})
+    upcoming = [make_event(), make_event()]
+    get_many = AsyncMock(return_value=upcoming)
+    refreshed = []
+
+    async def refresh_seats(self, event_id, client):
+        refreshed.append(event_id)
+
+    with (
+        patch.object(dev_settings, "SEATS_REFRESH_TOP_N", 2),
+        patch.object(event_service, "async_session_local", fake_session),
+        patch.object(events_crud, "get_many", get_many),
+        patch.object(EventService, "_refresh_seats", refresh_seats),
+    ):
+        await refresh_popular_seats(MagicMock())
+
+    id_filter = get_many.await_args.args[1]
+    assert set(id_filter.right.value) == {popular, runner_up}
+    assert get_many.await_args.kwargs["limit"] == 2
+    assert refreshed == [event.id for event in upcoming]
+    assert not seats_requests_counter
@@ -0,0 +1,37 @@
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlsplit
+
+from src.services.event_service import EventService
+
+
+def query_of(url):
+    return parse_qs(urlsplit(url).query)
+
+
+def test_page_url_encodes_filter_values():
+    """Filter values with reserved characters survive the round trip"""
+    service = EventService(MagicMock())
+    params = {"name": "rock & roll=page=3", "city": "Rostov-on-Don", "page": "3"}
+
+    url = service._build_page_url("http://test/api/events", params, 4)
+
+    assert url.startswith("http://test/api/events/?")
+    assert query_of(url) == {
+        "name": ["rock & roll=page=3"],
+        "city": ["Rostov-on-Don"],
+        "page": ["4"],
+    }
+
+
+def test_cursor_url_drops_page_and_encodes_values():
+    """Cursor links keep filters encoded, with page replaced by cursor"""
+    service = EventService(MagicMock())
+    params = {"name": "a&b", "page": "2", "cursor": "old"}
+
+    url = service._build_cursor_url("http://test/api/events/", params, "new")
+
+    assert query_of(url) == {
+        "name": ["a&b"],
+        "pagination": ["cursor"],
+        "cursor": ["new"],
+    }
@@ -0,0 +1,48 @@
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.dependencies import get_read_event_service
+from src.api.exception_handlers import domain_exception_handler
+from src.api.routes.events import events_router
+from src.api.routes.exceptions import DomainError
+from src.services.event_service import EventNotFoundError
+from src.utils.http_cache import make_etag
+
+VERSION = datetime(2026, 1, 1, tzinfo=UTC)
+
+service = MagicMock()
+service.get_data_version = AsyncMock(return_value=VERSION)
+service.get_single_event = AsyncMock(side_effect=EventNotFoundError("Not found"))
+
+app = FastAPI()
+app.include_router(events_router)
+app.add_exception_handler(DomainError, domain_exception_handler)
+app.dependency_overrides[get_read_event_service] = lambda: service
+
+
+def test_missing_event_is_not_found_despite_current_etag():
+    """Matching If-None-Match does not turn 404 for unknown event into 304"""
+    with TestClient(app) as client:
+        response = client.get(
+            f"/api/events/{uuid4()}", headers={"If-None-Match": make_etag(VERSION)}
+        )
+
+    assert response.status_code == 404
+
+
+def test_listing_links_ignore_unknown_query_parameters():
+    """Cached listing links are built from validated parameters only"""
+    service.get_events_json = AsyncMock(return_value=b"{}")
+
+    with TestClient(app) as client:
+        client.get("/api/events", params={"page": 2, "token": "secret"})
+
+    kwargs = service.get_events_json.await_args.kwargs
+    cache_key = service.get_events_json.await_args.args[0]
+    assert "token" not in kwargs["query_params"]
+    assert kwargs["query_params"]["page"] == 2
+    assert cache_key[2] == tuple(sorted(kwargs["query_params"].items()))
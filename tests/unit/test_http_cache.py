@@ -0,0 +1,37 @@
+from datetime import UTC, datetime
+
+from starlette.datastructures import Headers
+
+from src.utils.http_cache import is_not_modified, make_etag
+
+VERSION = datetime(2026, 1, 1, 12, 0, 0, 500000, tzinfo=UTC)
+ETAG = make_etag(VERSION)
+
+
+def test_if_none_match_matches_weakly():
+    """Entity tags are compared weakly, any of listed tags may match"""
+    headers = Headers({"if-none-match": f'"other", {ETAG.removeprefix("W/")}'})
+
+    assert is_not_modified(headers, ETAG, VERSION)
+    assert not is_not_modified(Headers({"if-none-match": '"other"'}), ETAG, VERSION)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    """If-Modified-Since is ignored when If-None-Match is present"""
+    headers = Headers({
+        "if-none-match": '"other"',
+        "if-modified-since": "Thu, 01 Jan 2026 12:00:00 GMT",
+    })
+
+    assert not is_not_modified(headers, ETAG, VERSION)
+
+
+def test_if_modified_since_uses_second_precision():
+    """Last-Modified is truncated to seconds before comparison"""
+    fresh = Headers({"if-modified-since": "Thu, 01 Jan 2026 12:00:00 GMT"})
+    stale = Headers({"if-modified-since": "Thu, 01 Jan 2026 11:59:59 GMT"})
+    broken = Headers({"if-modified-since": "yesterday"})
+
+    assert is_not_modified(fresh, ETAG, VERSION)
+    assert not is_not_modified(stale, ETAG, VERSION)
+    assert not is_not_modified(broken, ETAG, VERSION)
@@ -0,0 +1,106 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.database.leader_election import LeaderElection
+
+
+class FakeLockServer:
+    """Stand-in for Postgres advisory lock shared by several processes"""
+
+    def __init__(self):
+        self.owner = None
+
+    def engine(self, process):
+        server = self
+
+        class Connection:
+            async def execution_options(self, **kwargs):
+                return self
+
+            async def execute(self, stmt, params=None):
+                result = MagicMock()
+                if "pg_try_advisory_lock" in str(stmt):
+                    if server.owner is None:
+                        server.owner = process
+                    result.scalar.return_value = server.owner == process
+                elif "pg_advisory_unlock" in str(stmt):
+                    server.owner = None
+                return result
+
+            async def invalidate(self):
+                pass
+
+        engine = MagicMock()
+        engine.connect = asynccontextmanager(lambda: _yield(Connection()))
+        return engine
+
+
+async def _yield(value):
+    yield value
+
+
+@pytest.mark.asyncio
+async def test_leadership_passes_over_when_leader_stops():
+    """Only one process leads at a time, another takes over after it stops"""
+    server = FakeLockServer()
+    calls = []
+
+    def election(process):
+        async def on_elected():
+            calls.append(f"{process} elected")
+
+        async def on_demoted():
+            calls.append(f"{process} demoted")
+
+        return LeaderElection(
+            server.engine(process), "jobs", on_elected, on_demoted, 0.01
+        )
+
+    first, second = election("first"), election("second")
+    first.start()
+    await asyncio.sleep(0.005)
+    second.start()
+    await asyncio.sleep(0.03)
+    assert (first.is_leader, second.is_leader) == (True, False)
+
+    await first.stop()
+    await asyncio.sleep(0.03)
+    assert (first.is_leader, second.is_leader) == (False, True)
+
+    await second.stop()
+    assert calls == [
+        "first elected",
+        "first demoted",
+        "second elected",
+        "second demoted",
+    ]
+    assert server.owner is None
+
+
+@pytest.mark.asyncio
+async def test_failing_callback_does_not_stop_campaigning():
+    """Leader steps down after callback error and keeps campaigning"""
+    server = FakeLockServer()
+    attempts = []
+
+    async def on_elected():
+        attempts.append("elected")
+        if len(attempts) == 1:
+            raise RuntimeError("Scheduler is not running")
+
+    async def on_demoted():
+        pass
+
+    election = LeaderElection(
+        server.engine("only"), "jobs", on_elected, on_demoted, 0.01
+    )
+    election.start()
+    await asyncio.sleep(0.05)
+
+    assert election.is_leader
+    assert len(attempts) == 2
+    await election.stop()
+    assert server.owner is None
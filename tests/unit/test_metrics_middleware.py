@@ -0,0 +1,36 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.middleware.metrics_middleware import UNMATCHED_ENDPOINT, MetricsMiddleware
+
+app = FastAPI()
+app.add_middleware(MetricsMiddleware)
+
+
+@app.get("/items/{item_id}")
+async def get_item(item_id: int):
+    return {"item_id": item_id}
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_metrics_middleware_labels_by_route_template():
+    """Requests are counted by route template, unknown paths share one label"""
+    labels = {"method": "GET", "endpoint": "/items/{item_id}"}
+    unmatched = {"method": "GET", "endpoint": UNMATCHED_ENDPOINT, "status": "404"}
+    requests_before = sample("http_requests_total", status="200", **labels)
+    size_before = sample("http_response_size_bytes_sum", **labels)
+    unmatched_before = sample("http_requests_total", **unmatched)
+
+    with TestClient(app) as client:
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing/3")
+
+    assert sample("http_requests_total", status="200", **labels) == requests_before + 2
+    assert sample("http_response_size_bytes_sum", **labels) == size_before + 26
+    assert sample("http_requests_total", **unmatched) == unmatched_before + 1
+    assert sample("http_requests_in_progress", method="GET") == 0
@@ -0,0 +1,97 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.models.outbox import OutboxStatus
+from src.services import outbox_service
+
+
+class FakeSessions:
+    """Session factory stub tracking whether a session is open"""
+
+    def __init__(self):
+        self.open = False
+        self.commits = 0
+
+    @asynccontextmanager
+    async def __call__(self):
+        self.open = True
+        db = MagicMock()
+
+        async def commit():
+            self.commits += 1
+
+        db.commit = commit
+        try:
+            yield db
+        finally:
+            self.open = False
+
+
+async def test_events_are_claimed_and_dispatched_outside_transaction():
+    """No session stays open while notifications are being sent"""
+    sessions = FakeSessions()
+    events = [
+        SimpleNamespace(
+            id=i, payload={"n": i}, retry_count=0, next_attempt_at=datetime.now(UTC)
+        )
+        for i in range(3)
+    ]
+    sent_with_open_session = []
+
+    async def send_notification(payload):
+        sent_with_open_session.append(sessions.open)
+
+    client = MagicMock(send_notification=send_notification)
+    crud = MagicMock(
+        get_many_with_lock=AsyncMock(return_value=events),
+        update_where=AsyncMock(),
+        bulk_update=AsyncMock(),
+    )
+
+    with (
+        patch.object(outbox_service, "async_session_local", sessions),
+        patch.object(outbox_service, "outbox_crud", crud),
+    ):
+        processed = await outbox_service.outbox_process_events(client)
+
+    assert processed == 3
+    assert sent_with_open_session == [False, False, False]
+    crud.update_where.assert_awaited_once()
+    claimed_until = crud.update_where.await_args.kwargs["update_data"][
+        "next_attempt_at"
+    ]
+    assert claimed_until > datetime.now(UTC)
+    results = crud.bulk_update.await_args.args[1]
+    assert [r["status"] for r in results] == [OutboxStatus.SENT] * 3
+    assert sessions.commits == 2
+
+
+async def test_listener_survives_unexpected_dispatch_error():
+    """Unexpected error is logged and listener reconnects instead of dying"""
+    connects = []
+
+    async def connect(dsn):
+        conn = MagicMock(add_listener=AsyncMock(), close=AsyncMock())
+        conn.is_closed.return_value = False
+        connects.append(conn)
+        return conn
+
+    dispatch = AsyncMock(side_effect=[RuntimeError("boom"), 0, 0])
+    listener = outbox_service.OutboxListener(MagicMock())
+
+    with (
+        patch.object(outbox_service.asyncpg, "connect", connect),
+        patch.object(outbox_service, "outbox_process_events", dispatch),
+        patch.object(outbox_service, "LISTENER_RECONNECT_DELAY", 0),
+    ):
+        listener.start()
+        for _ in range(20):
+            await asyncio.sleep(0)
+        await listener.stop()
+
+    assert len(connects) >= 2
+    assert dispatch.await_count >= 2
+    connects[0].close.assert_awaited_once()
@@ -0,0 +1,48 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from src.database.pool_metrics import (
+    db_pool_checkout_seconds,
+    db_pool_checkout_timeouts_total,
+    instrumented_pool_class,
+)
+
+
+def sample(metric, suffix, name):
+    for collected in metric.collect():
+        for s in collected.samples:
+            if s.name.endswith(suffix) and s.labels.get("engine") == name:
+                return s.value
+    return 0
+
+
+async def test_checkout_is_timed():
+    pool = instrumented_pool_class("test_timed")(MagicMock, pool_size=1)
+
+    conn = await greenlet_spawn(pool.connect)
+    conn.close()
+
+    assert sample(db_pool_checkout_seconds, "_count", "test_timed") == 1
+
+
+async def test_checkout_timeout_is_counted():
+    pool = instrumented_pool_class("test_timeout")(
+        MagicMock, pool_size=1, max_overflow=0, timeout=0.01
+    )
+    held = await greenlet_spawn(pool.connect)
+
+    with pytest.raises(PoolTimeoutError):
+        await greenlet_spawn(pool.connect)
+
+    assert sample(db_pool_checkout_timeouts_total, "_total", "test_timeout") == 1
+    assert sample(db_pool_checkout_seconds, "_count", "test_timeout") == 2
+    held.close()
+
+
+def test_recreated_pool_keeps_name():
+    pool = instrumented_pool_class("test_recreate")(MagicMock, pool_size=1)
+
+    assert pool.recreate().metrics_name == "test_recreate"
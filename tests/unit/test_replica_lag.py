@@ -0,0 +1,66 @@
+import asyncio
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from sqlalchemy.exc import OperationalError
+
+from src.database.replica import ReplicaLagCheck
+
+
+class FakeReplica:
+    """Stand-in for replica engine reporting configurable lag"""
+
+    def __init__(self, lag):
+        self.lag = lag
+        self.checks = 0
+
+    @asynccontextmanager
+    async def connect(self):
+        replica = self
+
+        class Connection:
+            async def execute(self, stmt):
+                replica.checks += 1
+                await asyncio.sleep(0)
+                if isinstance(replica.lag, Exception):
+                    raise replica.lag
+                result = MagicMock()
+                result.scalar.return_value = replica.lag
+                return result
+
+        yield Connection()
+
+
+async def test_usable_within_max_lag():
+    check = ReplicaLagCheck(FakeReplica(Decimal("0.5")), max_lag=5, check_interval=60)
+
+    assert await check.is_usable()
+
+
+async def test_unusable_when_lagging_unknown_or_failing():
+    for lag in (Decimal("12.3"), None, OperationalError("SELECT", {}, OSError())):
+        check = ReplicaLagCheck(FakeReplica(lag), max_lag=5, check_interval=60)
+
+        assert not await check.is_usable()
+
+
+async def test_concurrent_callers_share_check():
+    replica = FakeReplica(0)
+    check = ReplicaLagCheck(replica, max_lag=5, check_interval=60)
+
+    results = await asyncio.gather(*(check.is_usable() for _ in range(10)))
+
+    assert all(results)
+    assert replica.checks == 1
+
+
+async def test_rechecks_after_interval():
+    replica = FakeReplica(0)
+    check = ReplicaLagCheck(replica, max_lag=5, check_interval=0)
+    assert await check.is_usable()
+
+    replica.lag = 30
+
+    assert not await check.is_usable()
+    assert replica.checks == 2
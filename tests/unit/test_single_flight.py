@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    """Concurrent callers with same key share one underlying call"""
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "seats"
+
+    callers = [asyncio.create_task(flight.do("event", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*callers)
+
+    assert calls == 1
+    assert [result for result, _ in results] == ["seats"] * 5
+    assert sum(not shared for _, shared in results) == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_and_allows_retry():
+    """Error is delivered to every caller and key is freed afterwards"""
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0)
+        raise RuntimeError("provider down")
+
+    results = await asyncio.gather(
+        flight.do("event", failing), flight.do("event", failing), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def ok():
+        return "seats"
+
+    assert await flight.do("event", ok) == ("seats", False)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_leader_cancellation():
+    """Cancelling the caller that started the call does not fail followers"""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "seats"
+
+    leader = asyncio.create_task(flight.do("event", fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("event", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    assert await follower == ("seats", True)
+    with pytest.raises(asyncio.CancelledError):
+        await leader
@@ -0,0 +1,95 @@
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.crud.base import UpsertResult
+from src.services.sync_service import (
+    SyncProgress,
+    SyncService,
+    SyncWindow,
+    merge_watermark,
+    split_sync_windows,
+)
+
+
+def dt(day, hour=0):
+    return datetime(2026, 1, day, hour, tzinfo=UTC)
+
+
+class FakeProviderClient:
+    """Provider stub returning events changed since given date, two per page"""
+
+    def __init__(self, events):
+        self.events = sorted(events, key=lambda e: e["changed_at"])
+
+    async def get_events(self, changed_at, next_url=None):
+        offset = int(next_url) if next_url else 0
+        matching = [
+            e
+            for e in self.events
+            if datetime.fromisoformat(e["changed_at"]).date() >= changed_at.date()
+        ]
+        page = matching[offset : offset + 2]
+        has_more = offset + 2 < len(matching)
+        return {"results": page, "next": str(offset + 2) if has_more else ""}
+
+
+def make_event(day, hour=12):
+    return {"id": f"{day}-{hour}", "changed_at": dt(day, hour).isoformat()}
+
+
+def test_split_sync_windows_covers_range_with_day_boundaries():
+    """Windows are contiguous, start at midnight and last one is open-ended"""
+    windows = split_sync_windows(dt(1, 15), dt(10, 8), 3)
+
+    assert [(w.start, w.end) for w in windows] == [
+        (dt(1, 15), dt(4)),
+        (dt(4), dt(7)),
+        (dt(7), dt(10)),
+        (dt(10), None),
+    ]
+
+
+def test_split_sync_windows_single_day():
+    """Range within one day yields a single open-ended window"""
+    windows = split_sync_windows(dt(1, 15), dt(1, 20), 4)
+
+    assert [(w.start, w.end) for w in windows] == [(dt(1, 15), None)]
+
+
+def test_merge_watermark_stops_at_first_unfinished_window():
+    """Watermark doesn't skip over a window that hasn't been walked fully"""
+    windows = [SyncWindow(dt(1), dt(3)), SyncWindow(dt(3), dt(5)), SyncWindow(dt(5))]
+    windows[0].page_max, windows[0].done = dt(2), True
+    windows[1].page_max = dt(3, 6)
+    windows[2].page_max, windows[2].done = dt(6), True
+
+    assert merge_watermark(windows) == dt(3, 6)
+
+    windows[1].done = True
+    assert merge_watermark(windows) == dt(6)
+
+
+@pytest.mark.asyncio
+async def test_parallel_sync_saves_every_event_once():
+    """Concurrent chains save each event exactly once and end at exact max"""
+    events = [make_event(day, hour) for day in range(1, 10) for hour in (3, 15)]
+    service = SyncService(MagicMock(), FakeProviderClient(events))
+    service._save_events = AsyncMock(
+        side_effect=lambda events: (UpsertResult(), UpsertResult())
+    )
+    service._save_checkpoint = AsyncMock()
+    service.db.commit = AsyncMock()
+    progress = SyncProgress(dt(1))
+
+    with patch(
+        "src.services.sync_service.split_sync_windows",
+        side_effect=lambda start, end, windows: split_sync_windows(start, dt(9), 4),
+    ):
+        await service._run_parallel(progress)
+
+    saved = [e["id"] for c in service._save_events.await_args_list for e in c.args[0]]
+    assert sorted(saved) == sorted(e["id"] for e in events)
+    assert progress.total_saved == len(events)
+    assert progress.current_max == dt(9, 15)
@@ -0,0 +1,127 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import HTTPStatusError, ReadTimeout
+from sqlalchemy.exc import OperationalError
+
+from src.crud.base import UpsertResult
+from src.services.event_service import event_cache
+from src.services.sync_service import (
+    EventsSyncFailedError,
+    SyncProgress,
+    SyncService,
+)
+
+
+class FakePaginator:
+    """Paginator stub yielding predefined pages, optionally failing after them"""
+
+    def __init__(self, pages, error=None):
+        self.pages = list(pages)
+        self.error = error
+        self.page_max = None
+        self.next_url = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.pages:
+            if self.error:
+                raise self.error
+            raise StopAsyncIteration
+        events = self.pages.pop(0)
+        self.page_max = max(e["changed_at"] for e in events)
+        return events
+
+
+def make_page(*days):
+    return [{"changed_at": datetime(2026, 1, day, tzinfo=UTC)} for day in days]
+
+
+@pytest.fixture
+def service():
+    service = SyncService(MagicMock(), MagicMock())
+    service._save_events = AsyncMock(
+        side_effect=lambda events: (UpsertResult(), UpsertResult())
+    )
+    service._save_checkpoint = AsyncMock()
+    service.db.commit = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_pipelined_sync_saves_all_pages_in_order(service):
+    """Pipelined mode saves every fetched page and tracks max changed_at"""
+    pages = [make_page(1, 2), make_page(3), make_page(5, 4)]
+    progress = SyncProgress(datetime(2000, 1, 1, tzinfo=UTC))
+
+    await service._run_pipelined(FakePaginator(pages), progress)
+
+    saved = [call.args[0] for call in service._save_events.await_args_list]
+    assert saved == [make_page(1, 2), make_page(3), make_page(5, 4)]
+    assert progress.total_saved == 5
+    assert progress.current_max == datetime(2026, 1, 5, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_pipelined_sync_raises_fetch_error_after_saving(service):
+    """Fetch error surfaces only after previously fetched pages are saved"""
+    error = HTTPStatusError("Error", request=MagicMock(), response=MagicMock())
+    progress = SyncProgress(datetime(2000, 1, 1, tzinfo=UTC))
+
+    with pytest.raises(HTTPStatusError):
+        await service._run_pipelined(
+            FakePaginator([make_page(1), make_page(2)], error), progress
+        )
+
+    assert service._save_events.await_count == 2
+    assert progress.current_max == datetime(2026, 1, 2, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("error", "raised"),
+    [
+        (ReadTimeout("Timed out"), EventsSyncFailedError),
+        (OperationalError("INSERT", {}, OSError()), OperationalError),
+    ],
+)
+async def test_failed_sync_records_failure_and_invalidates(service, error, raised):
+    """Pages committed before any failure are recorded and invalidated"""
+    saved = UpsertResult()
+    saved.add(["id"], [("saved", True)], 1)
+    service._save_events = AsyncMock(return_value=(saved, UpsertResult()))
+    progress = SyncProgress(datetime(2000, 1, 1, tzinfo=UTC))
+    service._get_last_changed_at = AsyncMock(return_value=progress.start_changed_at)
+    service._start_from_checkpoint = AsyncMock(
+        return_value=(FakePaginator([make_page(1)], error), progress)
+    )
+    service._update_sync_metadata = AsyncMock()
+    service._invalidate_caches = MagicMock()
+    service.db.rollback = AsyncMock()
+    service.db.execute = AsyncMock()
+
+    with pytest.raises(raised):
+        await service.sync("manual")
+
+    service._update_sync_metadata.assert_awaited_once()
+    assert service._update_sync_metadata.await_args.kwargs["status"] == "failed"
+    service._invalidate_caches.assert_called_once_with(["saved"], [])
+    assert "pg_notify" in str(service.db.execute.await_args.args[0])
+
+
+def test_invalidate_caches_drops_events_at_changed_places(service):
+    """Cached events embed their place, so place change evicts them too"""
+    event_cache.set("changed", SimpleNamespace(place_id="p1"))
+    event_cache.set("moved", SimpleNamespace(place_id="p2"))
+    event_cache.set("untouched", SimpleNamespace(place_id="p3"))
+
+    service._invalidate_caches(["changed"], ["p2"])
+
+    assert event_cache.get("changed") is None
+    assert event_cache.get("moved") is None
+    assert event_cache.get("untouched") is not None
+    event_cache.clear()
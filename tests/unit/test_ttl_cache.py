@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+from src.utils.ttl_cache import TTLCache
+
+
+def test_ttl_cache_expiry():
+    """Entry is served until its TTL runs out"""
+    cache = TTLCache(maxsize=10, ttl=30)
+    with patch("src.utils.ttl_cache.time.monotonic", return_value=100.0):
+        cache.set("key", 1)
+    with patch("src.utils.ttl_cache.time.monotonic", return_value=129.0):
+        assert cache.get("key") == 1
+    with patch("src.utils.ttl_cache.time.monotonic", return_value=130.0):
+        assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_lru_eviction():
+    """Least recently used entry is evicted once maxsize is exceeded"""
+    cache = TTLCache(maxsize=2, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_invalidate_and_disable():
+    """Invalidated entries are dropped, zero TTL disables caching"""
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate(["a", "missing"])
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    disabled = TTLCache(maxsize=10, ttl=0)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None
+
+
+def test_ttl_cache_invalidate_where():
+    """Entries whose values satisfy predicate are dropped"""
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    cache.invalidate_where(lambda value: value % 2)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") is None
+
+
+def test_ttl_cache_skips_values_loaded_before_invalidation():
+    """Value loaded before invalidation is not stored after it"""
+    cache = TTLCache(maxsize=10, ttl=30)
+    generation = cache.generation
+    cache.invalidate(["a"])
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is None
+
+    cache.set("a", "fresh", cache.generation)
+    assert cache.get("a") == "fresh"
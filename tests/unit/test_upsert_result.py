@@ -0,0 +1,14 @@
+from src.crud.base import UpsertResult
+
+
+def test_upsert_result_splits_returned_rows():
+    """Returned rows are split by 'inserted' flag, missing ones are unchanged"""
+    result = UpsertResult()
+
+    result.add(["id"], [(1, True), (2, False)], total=4)
+    result.add(["id"], [(3, True)], total=1)
+
+    assert result.inserted == [{"id": 1}, {"id": 3}]
+    assert result.updated == [{"id": 2}]
+    assert result.unchanged == 2
+    assert result.changed == [{"id": 1}, {"id": 3}, {"id": 2}]